@@ -6,7 +6,9 @@ Bidirectional semantic mappings for Hebrew<->English document processing.
 Following the pattern from datagov/enterprise_expansions.py with 22 domains.
 """
 
-from typing import Dict, Set, List
+import re
+import sys
+from typing import Dict, FrozenSet, Set, List, Optional, Tuple
 
 # ============================================================================
 # Document-Related Semantic Domains (5 domains, ~200+ terms)
@@ -72,6 +74,12 @@ DOCUMENT_EXPANSIONS: Dict[str, List[str]] = {
     ]
 }
 
+# Intern all terms: one string object per term across domains and indexes
+DOCUMENT_EXPANSIONS = {
+    domain: [sys.intern(t) for t in terms]
+    for domain, terms in DOCUMENT_EXPANSIONS.items()
+}
+
 
 # ============================================================================
 # Section 21.4 Equivalent: Build Bidirectional Index
@@ -79,7 +87,7 @@ DOCUMENT_EXPANSIONS: Dict[str, List[str]] = {
 
 def _build_bidirectional_index(
     expansions: Dict[str, List[str]]
-) -> Dict[str, Set[str]]:
+) -> Dict[str, FrozenSet[str]]:
     """
     Build bidirectional mapping from unidirectional expansions.
 
@@ -88,34 +96,65 @@ def _build_bidirectional_index(
 
     Output:
     {
-        "document": {"document", "מסמך", "file", "קובץ", ...},
-        "מסמך": {"document", "מסמך", "file", "קובץ", ...},
+        "document": frozenset({"document", "מסמך", "file", "קובץ", ...}),
+        "מסמך": frozenset({"document", "מסמך", "file", "קובץ", ...}),
         ...
     }
-    """
-    bidirectional: Dict[str, Set[str]] = {}
 
-    for domain, values in expansions.items():
-        all_terms = {v.lower() for v in values}
+    Each term maps to the union of the domains that directly contain it;
+    domains are not merged transitively through shared terms. Each domain's
+    terms are lowercased once into a frozenset; a term found in a single
+    domain reuses that frozenset as-is, and terms shared by the same group
+    of domains share one union frozenset object.
+    """
+    lowered: Dict[str, FrozenSet[str]] = {
+        domain: frozenset(sys.intern(v.lower()) for v in values)
+        for domain, values in expansions.items()
+    }
 
-        for term in all_terms:
-            if term in bidirectional:
-                bidirectional[term].update(all_terms)
-            else:
-                bidirectional[term] = all_terms.copy()
+    # term -> domains containing it, in definition order
+    containing: Dict[str, List[str]] = {}
+    for domain, terms in lowered.items():
+        for term in terms:
+            containing.setdefault(term, []).append(domain)
+
+    unions: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+    bidirectional: Dict[str, FrozenSet[str]] = {}
+    for term, domains in containing.items():
+        if len(domains) == 1:
+            bidirectional[term] = lowered[domains[0]]
+            continue
+        key = tuple(domains)
+        union = unions.get(key)
+        if union is None:
+            union = unions[key] = frozenset().union(*(lowered[d] for d in domains))
+        bidirectional[term] = union
 
     return bidirectional
 
 
-# Pre-built at startup
-BIDIRECTIONAL_INDEX: Dict[str, Set[str]] = _build_bidirectional_index(
-    DOCUMENT_EXPANSIONS
-)
+# Built on first use so processes that never expand don't pay for it
+_bidi_cache: Optional[Dict[str, FrozenSet[str]]] = None
 
 
-def get_bidirectional_expansions(term: str) -> Set[str]:
+def get_bidirectional_index() -> Dict[str, FrozenSet[str]]:
+    """Return the bidirectional index, building it on first call."""
+    global _bidi_cache
+    if _bidi_cache is None:
+        _bidi_cache = _build_bidirectional_index(DOCUMENT_EXPANSIONS)
+    return _bidi_cache
+
+
+def __getattr__(name: str):
+    # Backwards compatibility: BIDIRECTIONAL_INDEX used to be a module constant
+    if name == "BIDIRECTIONAL_INDEX":
+        return get_bidirectional_index()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_bidirectional_expansions(term: str) -> FrozenSet[str]:
     """Get all related terms for a given term."""
-    return BIDIRECTIONAL_INDEX.get(term.lower(), {term})
+    return get_bidirectional_index().get(term.lower(), frozenset((term,)))
 
 
 def get_all_terms() -> int:
@@ -123,6 +162,51 @@ def get_all_terms() -> int:
     return sum(len(terms) for terms in DOCUMENT_EXPANSIONS.values())
 
 
+# Case-folded terms and frozen expansions per domain, computed once at import
+_DOMAIN_TERMS_FOLDED: Dict[str, Tuple[str, ...]] = {
+    domain: tuple(sys.intern(t.casefold()) for t in terms)
+    for domain, terms in DOCUMENT_EXPANSIONS.items()
+}
+_DOMAIN_EXPANSIONS_FROZEN: Dict[str, FrozenSet[str]] = {
+    domain: frozenset(terms)
+    for domain, terms in DOCUMENT_EXPANSIONS.items()
+}
+_DOMAIN_NAMES: Tuple[str, ...] = tuple(_DOMAIN_TERMS_FOLDED)
+
+
+def _build_hyperscan_db():
+    """
+    Compile all case-folded terms into one Hyperscan literal database.
+
+    Pattern ids are domain indexes into _DOMAIN_NAMES, so a scan reports
+    matching domains directly. Matching UTF-8 bytes of the case-folded query
+    is equivalent to the substring test on str.
+    """
+    expressions: List[bytes] = []
+    ids: List[int] = []
+    for domain_id, terms_folded in enumerate(_DOMAIN_TERMS_FOLDED.values()):
+        for term in terms_folded:
+            expressions.append(re.escape(term).encode("utf-8"))
+            ids.append(domain_id)
+
+    db = hyperscan.Database()
+    db.compile(
+        expressions=expressions,
+        ids=ids,
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+    )
+    return db
+
+
+# Optional: Hyperscan scans the query once regardless of glossary size
+try:
+    import hyperscan
+    _HYPERSCAN_DB = _build_hyperscan_db()
+except Exception:
+    _HYPERSCAN_DB = None
+
+
 def expand_query(query: str) -> Set[str]:
     """
     Expand query with related terms from all matching domains.
@@ -134,12 +218,21 @@ def expand_query(query: str) -> Set[str]:
         Set of expanded terms
     """
     expanded: Set[str] = set()
-    query_lower = query.lower()
-
-    for domain, terms in DOCUMENT_EXPANSIONS.items():
-        terms_lower = [t.lower() for t in terms]
-        if any(term in query_lower for term in terms_lower):
-            expanded.update(terms)
+    query_folded = query.casefold()
+
+    if _HYPERSCAN_DB is not None:
+        matched: Set[int] = set()
+        _HYPERSCAN_DB.scan(
+            query_folded.encode("utf-8"),
+            match_event_handler=lambda domain_id, *_: matched.add(domain_id),
+        )
+        for domain_id in matched:
+            expanded |= _DOMAIN_EXPANSIONS_FROZEN[_DOMAIN_NAMES[domain_id]]
+        return expanded
+
+    for domain, terms_folded in _DOMAIN_TERMS_FOLDED.items():
+        if any(term in query_folded for term in terms_folded):
+            expanded |= _DOMAIN_EXPANSIONS_FROZEN[domain]
 
     return expanded
 
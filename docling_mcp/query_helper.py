@@ -17,20 +17,86 @@ import asyncio
 import hashlib
 import time
 import logging
+import mmap
+from collections import OrderedDict
+from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Set
+from typing import Optional, Dict, Any, List, FrozenSet, Tuple, Union
 import httpx
 
-from .document_expansions import BIDIRECTIONAL_INDEX
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Optional: SIMD-accelerated base64 (same API as the stdlib module)
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# Optional: orjson parses/serializes large Docling payloads several times
+# faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .document_expansions import get_bidirectional_index
 
 # Configuration
 DOCLING_BASE_URL = os.environ.get("DOCLING_BASE_URL", "http://dicta-docling:5001")
 DOCLING_TIMEOUT = int(os.environ.get("DOCLING_TIMEOUT_MS", "300000")) / 1000
 CACHE_DIR = os.environ.get("DOCLING_CACHE_DIR", "/app/data/docling/cache")
 
+# Bound (seconds) on the conversion submit request, including a synchronous
+# Docling response; polling the submitted task is bounded by DOCLING_TIMEOUT.
+# A document is submitted once and never resubmitted after a timeout.
+DOCLING_SUBMIT_TIMEOUT = float(os.environ.get("DOCLING_SUBMIT_TIMEOUT", DOCLING_TIMEOUT))
+
+# Upload local files as raw multipart bytes instead of base64 JSON. Falls back
+# to base64 automatically if the Docling server rejects the multipart endpoint.
+DOCLING_MULTIPART_UPLOAD = os.environ.get("DOCLING_MULTIPART_UPLOAD", "true").lower() == "true"
+
+# Documents of one convert_many batch converted at the same time
+DOCLING_BATCH_CONCURRENCY = max(int(os.environ.get("DOCLING_BATCH_CONCURRENCY", "4")), 1)
+
+# Status polling backoff (seconds): 0.25 -> 0.375 -> ... capped at 5
+POLL_INITIAL_INTERVAL = 0.25
+POLL_MAX_INTERVAL = 5.0
+POLL_BACKOFF_FACTOR = 1.5
+
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# JSON Helpers
+# ============================================================================
+
+def load_json(data: Any) -> Any:
+    """Parse JSON from bytes or str (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize to a JSON str with non-ASCII kept as-is (orjson when available).
+
+    Compact by default: tool output is read by LLMs and programs, where
+    indentation only adds bytes and tokens.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode("utf-8")
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
 # ============================================================================
 # Exception Classes with Hebrew/English Messages
 # ============================================================================
@@ -128,6 +194,73 @@ OUTPUT_FORMAT_MAP: Dict[str, str] = {
 # Query Decomposition (Section 21.2 Equivalent)
 # ============================================================================
 
+# Hebrew Unicode block, scanned in C instead of a per-character ord() loop
+_HEBREW_RE = re.compile(r"[\u0590-\u05FF]")
+
+
+# Intent and format patterns are invariant - built and compiled once at import.
+# Pattern literals are written case-folded and matched against a case-folded
+# query, so no IGNORECASE case-class expansion is needed at match time. The
+# sources themselves are compiled as written (folding them would also turn
+# escapes like \S or \W into \s or \w).
+_INTENT_SPECS: Dict[str, Dict[str, List[str]]] = {
+    "CONVERT": {
+        "hebrew": [r"המר", r"הפוך", r"שנה\s*פורמט", r"ייצא"],
+        "english": [r"convert", r"transform", r"export", r"change.*format"]
+    },
+    "READ": {
+        "hebrew": [r"קרא", r"הצג", r"פתח", r"ראה"],
+        "english": [r"read", r"show", r"open", r"display", r"view"]
+    },
+    "EXTRACT_TABLES": {
+        "hebrew": [r"חלץ\s*טבל", r"הוצא\s*טבל", r"מצא\s*טבל"],
+        "english": [r"extract.*table", r"get.*table", r"find.*table"]
+    },
+    "EXTRACT_IMAGES": {
+        "hebrew": [r"חלץ\s*תמונ", r"הוצא\s*תמונ"],
+        "english": [r"extract.*image", r"get.*image", r"find.*image"]
+    },
+    "OCR": {
+        "hebrew": [r"זהה\s*טקסט", r"סרוק", r"המר\s*תמונה\s*לטקסט", r"זיהוי\s*תווים"],
+        "english": [r"ocr", r"recognize.*text", r"scan", r"text.*from.*image"]
+    },
+    "SUMMARIZE": {
+        "hebrew": [r"סכם", r"תמצת", r"קצר"],
+        "english": [r"summarize", r"brief", r"summary"]
+    }
+}
+
+_FORMAT_PATTERNS: Dict[str, List[str]] = {
+    "markdown": [r"markdown", r"md", r"מרקדאון"],
+    "json": [r"json", r"ג'ייסון"],
+    "text": [r"text", r"txt", r"טקסט"],
+    "csv": [r"csv"],
+    "html": [r"html"]
+}
+
+# Each pattern is tagged with its language: (pattern, "hebrew" | "english"),
+# Hebrew patterns first within each intent
+COMPILED_INTENTS: Dict[str, List[Tuple[re.Pattern, str]]] = {
+    intent_name: [
+        (re.compile(p), lang)
+        for lang in ("hebrew", "english")
+        for p in specs[lang]
+    ]
+    for intent_name, specs in _INTENT_SPECS.items()
+}
+
+# A query without Hebrew characters can never match a Hebrew pattern
+_ENGLISH_INTENTS: Dict[str, List[Tuple[re.Pattern, str]]] = {
+    intent_name: [entry for entry in entries if entry[1] == "english"]
+    for intent_name, entries in COMPILED_INTENTS.items()
+}
+
+COMPILED_FORMAT_PATTERNS: Dict[str, List[re.Pattern]] = {
+    fmt: [re.compile(p) for p in patterns]
+    for fmt, patterns in _FORMAT_PATTERNS.items()
+}
+
+
 def detect_document_intent(query: str) -> Dict[str, Any]:
     """
     Decompose query into document intent (WHAT) and target (WHERE).
@@ -141,64 +274,30 @@ def detect_document_intent(query: str) -> Dict[str, Any]:
         "is_hebrew": True
     }
     """
-    query_lower = query.lower()
-
-    intents = {
-        "CONVERT": {
-            "hebrew": [r"המר", r"הפוך", r"שנה\s*פורמט", r"ייצא"],
-            "english": [r"convert", r"transform", r"export", r"change.*format"]
-        },
-        "READ": {
-            "hebrew": [r"קרא", r"הצג", r"פתח", r"ראה"],
-            "english": [r"read", r"show", r"open", r"display", r"view"]
-        },
-        "EXTRACT_TABLES": {
-            "hebrew": [r"חלץ\s*טבל", r"הוצא\s*טבל", r"מצא\s*טבל"],
-            "english": [r"extract.*table", r"get.*table", r"find.*table"]
-        },
-        "EXTRACT_IMAGES": {
-            "hebrew": [r"חלץ\s*תמונ", r"הוצא\s*תמונ"],
-            "english": [r"extract.*image", r"get.*image", r"find.*image"]
-        },
-        "OCR": {
-            "hebrew": [r"זהה\s*טקסט", r"סרוק", r"המר\s*תמונה\s*לטקסט", r"זיהוי\s*תווים"],
-            "english": [r"ocr", r"recognize.*text", r"scan", r"text.*from.*image"]
-        },
-        "SUMMARIZE": {
-            "hebrew": [r"סכם", r"תמצת", r"קצר"],
-            "english": [r"summarize", r"brief", r"summary"]
-        }
-    }
+    query_folded = query.casefold()
 
     # Detect intent
     detected_intent = None
     confidence = 0.0
-    is_hebrew = any(ord(c) >= 0x0590 and ord(c) <= 0x05FF for c in query)
+    is_hebrew = not query.isascii() and bool(_HEBREW_RE.search(query))
+
+    query_lang = "hebrew" if is_hebrew else "english"
+    compiled = COMPILED_INTENTS if is_hebrew else _ENGLISH_INTENTS
 
-    for intent_name, patterns in intents.items():
-        all_patterns = patterns["hebrew"] + patterns["english"]
-        for pattern in all_patterns:
-            if re.search(pattern, query_lower, re.IGNORECASE):
+    for intent_name, patterns in compiled.items():
+        for pattern, lang in patterns:
+            if pattern.search(query_folded):
                 detected_intent = intent_name
-                lang_patterns = patterns["hebrew"] if is_hebrew else patterns["english"]
-                confidence = 0.9 if pattern in lang_patterns else 0.7
+                confidence = 0.9 if lang == query_lang else 0.7
                 break
         if detected_intent:
             break
 
     # Detect target format
-    format_patterns = {
-        "markdown": [r"markdown", r"md", r"מרקדאון"],
-        "json": [r"json", r"ג'ייסון"],
-        "text": [r"text", r"txt", r"טקסט"],
-        "csv": [r"csv"],
-        "html": [r"html"]
-    }
-
     target_format = "markdown"  # default
-    for fmt, patterns in format_patterns.items():
+    for fmt, patterns in COMPILED_FORMAT_PATTERNS.items():
         for pattern in patterns:
-            if re.search(pattern, query_lower, re.IGNORECASE):
+            if pattern.search(query_folded):
                 target_format = fmt
                 break
 
@@ -218,53 +317,82 @@ def detect_document_intent(query: str) -> Dict[str, Any]:
 HEBREW_PREFIXES = ['ל', 'ב', 'מ', 'ה', 'ו', 'ש', 'כ']
 HEBREW_PLURAL_SUFFIXES = ['ים', 'ות']
 
+_HE_PREFIX_RE = re.compile(f"^[{''.join(HEBREW_PREFIXES)}]")
+_HE_SUFFIX_RE = re.compile(f"(?:{'|'.join(HEBREW_PLURAL_SUFFIXES)})$")
 
-def get_hebrew_variants(word: str) -> List[str]:
+
+@lru_cache(maxsize=100_000)
+def get_hebrew_variants(word: str) -> Tuple[str, ...]:
     """
     Generate all morphological variants of a Hebrew word.
 
+    Results are memoized; queries repeat the same words constantly.
+
     Examples:
-    "למסמך" -> ["למסמך", "מסמך"]
-    "קבצים" -> ["קבצים", "קבצ"]
+    "למסמך" -> ("למסמך", "מסמך", ...)
+    "קבצים" -> ("קבצים", "קבצ")
     """
     variants = [word]
     current = word
 
-    # Strip prefixes
-    for prefix in HEBREW_PREFIXES:
-        if current.startswith(prefix) and len(current) > len(prefix) + 1:
-            stripped = current[len(prefix):]
-            variants.append(stripped)
-            current = stripped
+    # Strip prefixes (in HEBREW_PREFIXES order, each at most once)
+    if _HE_PREFIX_RE.match(current):
+        for prefix in HEBREW_PREFIXES:
+            if current.startswith(prefix) and len(current) > len(prefix) + 1:
+                stripped = current[len(prefix):]
+                variants.append(stripped)
+                current = stripped
 
-    # Strip plural suffixes
-    for suffix in HEBREW_PLURAL_SUFFIXES:
-        if current.endswith(suffix) and len(current) > len(suffix) + 1:
-            singular = current[:-len(suffix)]
-            variants.append(singular)
+    # Strip plural suffix
+    match = _HE_SUFFIX_RE.search(current)
+    if match and match.start() > 1:
+        variants.append(current[:match.start()])
 
-    return list(set(variants))
+    return tuple(dict.fromkeys(variants))
 
 
 # ============================================================================
 # Bidirectional Expansion (Section 21.4 Equivalent)
 # ============================================================================
 
-def get_document_expansions(term: str) -> Set[str]:
+def get_document_expansions(term: str) -> FrozenSet[str]:
     """Get bidirectional expansions for document-related terms."""
-    return BIDIRECTIONAL_INDEX.get(term.lower(), {term})
+    return get_bidirectional_index().get(term.lower(), frozenset((term,)))
 
 
 # ============================================================================
 # File Type Detection (Section 21.5 Equivalent)
 # ============================================================================
 
+def _file_name(file_path: str) -> str:
+    """
+    Final path component, same as PurePosixPath(file_path).name.
+
+    Trailing separators and trailing "." components are skipped the way
+    pathlib normalizes them.
+    """
+    while True:
+        head, _, name = file_path.rstrip("/").rpartition("/")
+        if name != ".":
+            return name
+        file_path = head
+
+
+def _file_extension(file_path: str) -> str:
+    """Lowercased PurePosixPath(file_path).suffix, without building a Path."""
+    name = _file_name(file_path)
+    dot = name.rfind(".")
+    if 0 < dot < len(name) - 1:
+        return name[dot:].lower()
+    return ""
+
+
 def detect_file_type(file_path: str) -> Dict[str, Any]:
     """Detect file type and recommended processing options."""
-    ext = Path(file_path).suffix.lower()
+    ext = _file_extension(file_path)
 
-    if ext in SUPPORTED_FORMATS:
-        info = SUPPORTED_FORMATS[ext]
+    info = SUPPORTED_FORMATS.get(ext)
+    if info is not None:
         return {
             "supported": True,
             "extension": ext,
@@ -292,7 +420,7 @@ def get_document_schema(file_path: str) -> Dict[str, Any]:
 
     return {
         "file_path": file_path,
-        "file_name": Path(file_path).name,
+        "file_name": _file_name(file_path),
         "file_type": file_info,
         "processing_options": {
             "formats_available": ["markdown", "json", "text"],
@@ -309,6 +437,54 @@ def get_document_schema(file_path: str) -> Dict[str, Any]:
 # Document Caching (Section 21.17 Equivalent)
 # ============================================================================
 
+# Optional: non-cryptographic SIMD hashers, far faster than SHA256 on large
+# files. Preference: xxh3_128 (xxhash), then blake3, then stdlib SHA256.
+try:
+    from xxhash import xxh3_128 as _fast_hasher
+except ImportError:
+    try:
+        from blake3 import blake3 as _fast_hasher
+    except ImportError:
+        _fast_hasher = None
+
+_HASH_CHUNK_SIZE = 1 << 20  # 1MB
+
+
+@lru_cache(maxsize=1024)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    """
+    Fingerprint file contents without loading the whole file into memory.
+
+    Uses xxhash/blake3 when installed, otherwise hashlib.file_digest (SHA256
+    in C, GIL released). Hashing content rather than the path keeps cache
+    hits across renames and copies. mtime_ns and size are part of the memo
+    key so a modified file is re-hashed instead of served from the memo.
+    """
+    with open(path, "rb", buffering=0) as f:
+        if _fast_hasher is not None:
+            h = _fast_hasher()
+            for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                h.update(block)
+            return h.hexdigest()
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        for block in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            h.update(block)
+        return h.hexdigest()
+
+
+# Optional: zstd-compressed cache payloads (3-5x smaller on markdown)
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+CACHE_TTL_SECONDS = 86400  # 24h
+_CACHE_TTL_NS = CACHE_TTL_SECONDS * 1_000_000_000
+MEMORY_CACHE_SIZE = 32  # Decoded results kept in-process
+
+
 class DocumentCache:
     """Cache converted documents to avoid redundant processing."""
 
@@ -320,33 +496,276 @@ class DocumentCache:
             # If we can't create cache dir, disable caching
             self.cache_dir = None
 
+        # In-process LRU of decoded results: key -> (written_at_ns, content)
+        self._memory: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+
+        self._suffix = ".cache.zst" if _zstd is not None else ".cache"
+
     def get_cache_key(self, file_path: str, fmt: str, ocr: bool) -> str:
-        """Generate cache key from parameters using SHA256."""
+        """Generate cache key from file content digest and parameters."""
         try:
-            file_hash = hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+            st = os.stat(file_path)
+            file_hash = _file_digest(file_path, st.st_mtime_ns, st.st_size)
         except Exception:
             file_hash = hashlib.sha256(file_path.encode()).hexdigest()
-        return f"{file_hash}_{fmt}_{ocr}"
+        # 64 bits of digest is plenty for a cache key and keeps filenames short
+        return f"{file_hash[:16]}_{fmt}_{int(ocr)}"
+
+    def _cache_path(self, key: str) -> Path:
+        """Entry path, sharded by key prefix to bound per-directory size."""
+        return self.cache_dir / key[:2] / f"{key}{self._suffix}"
+
+    def _remember(self, key: str, written_at_ns: int, content: str) -> None:
+        """Store a decoded result in the in-process LRU."""
+        self._memory[key] = (written_at_ns, content)
+        self._memory.move_to_end(key)
+        if len(self._memory) > MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+    # zstd compressor/decompressor objects are not thread-safe, so one is
+    # created per call (encode/decode run in worker threads)
+    def _encode(self, content: str) -> bytes:
+        data = content.encode("utf-8")
+        if _zstd is not None:
+            return _zstd.ZstdCompressor(level=3).compress(data)
+        return data
+
+    def _decode(self, data: bytes) -> str:
+        if _zstd is not None:
+            data = _zstd.ZstdDecompressor().decompress(data)
+        return data.decode("utf-8")
+
+    def _read_entry(self, key: str, now_ns: int) -> Optional[Tuple[int, str]]:
+        """Blocking read of a fresh cache entry: (mtime_ns, content) or None."""
+        # Single stat: a miss costs one syscall, a hit skips exists()
+        cache_file = self._cache_path(key)
+        try:
+            st = os.stat(cache_file)
+        except FileNotFoundError:
+            return None
+        if now_ns - st.st_mtime_ns >= _CACHE_TTL_NS:
+            return None
+
+        try:
+            return st.st_mtime_ns, self._decode(cache_file.read_bytes())
+        except Exception as e:
+            logger.warning(f"Failed to read cached result: {e}")
+            return None
+
+    def _write_entry(self, key: str, content: str) -> None:
+        """Blocking write of a cache entry."""
+        cache_file = self._cache_path(key)
+        cache_file.parent.mkdir(exist_ok=True)
+        cache_file.write_bytes(self._encode(content))
 
     async def get(self, key: str) -> Optional[str]:
         """Get cached result if exists and not expired (24h)."""
         if not self.cache_dir:
             return None
-        cache_file = self.cache_dir / f"{key}.cache"
-        if cache_file.exists():
-            if time.time() - cache_file.stat().st_mtime < 86400:
-                return cache_file.read_text(encoding="utf-8")
-        return None
+
+        now_ns = time.time_ns()
+        hit = self._memory.get(key)
+        if hit is not None:
+            if now_ns - hit[0] < _CACHE_TTL_NS:
+                self._memory.move_to_end(key)
+                return hit[1]
+            del self._memory[key]
+
+        # Disk read + decode runs in a worker thread, off the event loop
+        entry = await asyncio.to_thread(self._read_entry, key, now_ns)
+        if entry is None:
+            return None
+        self._remember(key, *entry)
+        return entry[1]
 
     async def set(self, key: str, content: str) -> None:
         """Cache conversion result."""
         if not self.cache_dir:
             return
-        cache_file = self.cache_dir / f"{key}.cache"
         try:
-            cache_file.write_text(content, encoding="utf-8")
+            await asyncio.to_thread(self._write_entry, key, content)
         except Exception as e:
             logger.warning(f"Failed to cache result: {e}")
+        self._remember(key, time.time_ns(), content)
+
+
+# ============================================================================
+# Request Body Assembly
+# ============================================================================
+
+# Multiple of 3, so each chunk base64-encodes without mid-stream padding
+_B64_CHUNK_SIZE = 57 * 1024
+
+# Files above this are mmapped rather than read through the heap
+MMAP_THRESHOLD_BYTES = 64 * 1024 * 1024
+
+
+# Rejected paths (unsupported format / missing file) remembered briefly
+NEGATIVE_CACHE_TTL_SECONDS = 10
+NEGATIVE_CACHE_SIZE = 256
+
+# Total bytes of read/encoded sources kept for reuse across convert/extract
+# calls on one file (0 disables). A payload larger than this isn't memoized.
+SOURCE_CACHE_MAX_BYTES = int(os.environ.get("DOCLING_SOURCE_CACHE_MB", "16")) * 1024 * 1024
+
+
+def _encode_file_base64(file_path: Path) -> bytes:
+    """
+    Base64-encode a file, never holding it as a Python str.
+
+    Very large files are mapped and encoded in one pass straight from the
+    page cache; smaller ones are read in chunks.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return base64.b64encode(mm)
+        parts = []
+        for chunk in iter(lambda: f.read(_B64_CHUNK_SIZE), b""):
+            parts.append(base64.b64encode(chunk))
+    return b"".join(parts)
+
+
+def _form_fields(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Docling options as multipart form fields (lists repeat, bools lowercase)."""
+    return {
+        key: str(value).lower() if isinstance(value, bool) else value
+        for key, value in options.items()
+    }
+
+
+class _OptionsTemplate:
+    """
+    Static Docling options, encoded once for JSON bodies and multipart forms.
+
+    Only the per-call fields are encoded on each request.
+    """
+
+    __slots__ = ("json", "form")
+
+    def __init__(self, options: Dict[str, Any]):
+        self.json = json.dumps(options).encode("utf-8")
+        self.form = _form_fields(options)
+
+    def to_json(self, **fields: Any) -> bytes:
+        """Splice per-call fields into the pre-serialized options object."""
+        if not fields:
+            return self.json
+        head = json.dumps(fields).encode("utf-8")
+        if self.json == b"{}":
+            return head
+        return head[:-1] + b"," + self.json[1:]
+
+    def to_form(self, **fields: Any) -> Dict[str, Any]:
+        """Static form fields plus the per-call ones."""
+        return {**self.form, **_form_fields(fields)}
+
+
+# Static Docling option blocks (matching Gradio UI defaults exactly)
+# Reference: /home/ilan/BricksLLM/docling/gradio_ui.py lines 658-678
+_CONVERT_OPTIONS = _OptionsTemplate({
+    # Pipeline settings - standard first, OCR as fallback only
+    "pipeline": "standard",
+    "pdf_backend": "dlparse_v4",
+    # OCR settings - enabled as fallback, NOT forced
+    "force_ocr": False,
+    "ocr_engine": "auto",
+    "ocr_lang": ["en", "he"],
+    # Table extraction - accurate mode
+    "table_mode": "accurate",
+    # Image handling - placeholder to avoid large base64 in response
+    "image_export_mode": "placeholder",
+    # Additional options
+    "abort_on_error": False,
+    "return_as_file": False,
+    "do_code_enrichment": False,
+    "do_formula_enrichment": False,
+    "do_picture_classification": False,
+    "do_picture_description": False,
+})
+
+_URL_OPTIONS = _OptionsTemplate({
+    "pipeline": "standard",
+    "pdf_backend": "dlparse_v4",
+    "force_ocr": False,
+    "ocr_engine": "auto",
+    "ocr_lang": ["en", "he"],
+    "table_mode": "accurate",
+    "image_export_mode": "placeholder",
+    "abort_on_error": False,
+    "return_as_file": False,
+})
+
+_IMAGE_OPTIONS = _OptionsTemplate({
+    "to_formats": ["json"],
+    "pipeline": "standard",
+    "pdf_backend": "dlparse_v4",
+    "image_export_mode": "embedded",  # Need embedded for image extraction
+    "do_picture_description": False,
+    "ocr": False,
+    "force_ocr": False,
+})
+
+
+def _build_file_request_body(
+    base64_content: bytes,
+    filename: str,
+    options: bytes
+) -> bytes:
+    """
+    Assemble the Docling file-source JSON body as bytes.
+
+    The encoded file and pre-serialized options are spliced in as-is, so
+    httpx does not re-serialize a multi-MB string through json.dumps.
+    """
+    return b"".join((
+        b'{"sources":[{"kind":"file","base64_string":"',
+        base64_content,
+        b'","filename":',
+        json.dumps(filename).encode("utf-8"),
+        b'}],"options":',
+        options,
+        b',"target":{"kind":"inbody"}}',
+    ))
+
+
+def _build_url_request_body(url: str, options: bytes) -> bytes:
+    """Assemble the Docling http-source JSON body as bytes."""
+    return b"".join((
+        b'{"sources":[{"kind":"http","url":',
+        json.dumps(url).encode("utf-8"),
+        b'}],"options":',
+        options,
+        b',"target":{"kind":"inbody"}}',
+    ))
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Statuses meaning the server has no usable multipart upload endpoint
+_MULTIPART_UNSUPPORTED_STATUS = frozenset({404, 405, 415})
+
+
+# Docling result field holding each output format: document["{format}_content"]
+_RESULT_CONTENT_KEYS: Dict[str, str] = {
+    "md": "md_content",
+    "json": "json_content",
+    "html": "html_content",
+    "text": "text_content",
+}
+
+# Characters that make csv.writer quote a field (QUOTE_MINIMAL)
+_CSV_SPECIAL_RE = re.compile(r'[",\r\n]')
+
+
+class _SharedConversion:
+    """A conversion task and the number of callers awaiting it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[str]"):
+        self.task = task
+        self.waiters = 0
 
 
 # ============================================================================
@@ -360,6 +779,180 @@ class DocumentHelper:
         self.base_url = DOCLING_BASE_URL
         self.timeout = DOCLING_TIMEOUT
         self.cache = DocumentCache()
+        self._client: Optional[httpx.AsyncClient] = None
+        # (path, mtime_ns, size, base64?) -> file content
+        self._sources: "OrderedDict[Tuple[str, int, int, bool], bytes]" = OrderedDict()
+        self._sources_bytes = 0
+        self._multipart_upload = DOCLING_MULTIPART_UPLOAD
+        # (file_path, check_format) -> (rejected_at, validation error)
+        self._neg_cache: Dict[Tuple[str, bool], Tuple[float, DocumentHelperError]] = {}
+        # cache_key -> pending conversion shared by concurrent duplicate calls
+        self._in_flight: Dict[str, _SharedConversion] = {}
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Shared AsyncClient, created on first use.
+
+        Reusing one pooled client keeps TCP connections alive across the
+        submit -> poll -> result calls and across concurrent tool calls.
+        With h2 installed, HTTPS endpoints negotiate HTTP/2 and multiplex
+        all submits and polls over a single connection; plain-HTTP Docling
+        keeps HTTP/1.1 keep-alive (no h2c prior knowledge is assumed).
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64
+                )
+            )
+        return self._client
+
+    async def _prepare_source(
+        self,
+        file_path: Path,
+        encode: bool = True
+    ) -> Tuple[bytes, str]:
+        """
+        Read a file, base64-encoded unless encode=False: (content, filename).
+
+        Memoized by (path, mtime, size) in an LRU bounded by
+        SOURCE_CACHE_MAX_BYTES in total, so convert, extract_tables,
+        extract_images and ocr on the same file read and encode it only
+        once. Reading runs in a worker thread.
+        """
+        st = file_path.stat()
+        key = (str(file_path), st.st_mtime_ns, st.st_size, encode)
+
+        content = self._sources.get(key)
+        if content is not None:
+            self._sources.move_to_end(key)
+            return content, file_path.name
+
+        reader = _encode_file_base64 if encode else Path.read_bytes
+        content = await asyncio.to_thread(reader, file_path)
+        if len(content) <= SOURCE_CACHE_MAX_BYTES and key not in self._sources:
+            # A concurrent miss on the same key may have cached it meanwhile;
+            # only the first insert is counted
+            self._sources[key] = content
+            self._sources_bytes += len(content)
+            while self._sources_bytes > SOURCE_CACHE_MAX_BYTES:
+                self._sources_bytes -= len(self._sources.popitem(last=False)[1])
+        return content, file_path.name
+
+    async def _submit_file(
+        self,
+        file_path: Path,
+        options: _OptionsTemplate,
+        timeout: Any = httpx.USE_CLIENT_DEFAULT,
+        **fields: Any
+    ) -> httpx.Response:
+        """
+        POST a local file for async conversion.
+
+        Sends the raw bytes as multipart/form-data to /v1/convert/file/async,
+        skipping base64 on both ends. Files too large for the source cache
+        are streamed from an open file instead of being read into memory.
+        If the server has no such endpoint, switches this helper to the
+        base64 JSON source endpoint for good; a 422 only retries this one
+        request as base64.
+        """
+        client = await self._get_client()
+        try:
+            if self._multipart_upload:
+                with ExitStack() as stack:
+                    if file_path.stat().st_size > SOURCE_CACHE_MAX_BYTES:
+                        filename = file_path.name
+                        content = stack.enter_context(open(file_path, "rb"))
+                    else:
+                        content, filename = await self._prepare_source(file_path, encode=False)
+                    response = await client.post(
+                        f"{self.base_url}/v1/convert/file/async",
+                        files={"files": (filename, content, "application/octet-stream")},
+                        data=options.to_form(**fields),
+                        timeout=timeout
+                    )
+                if response.status_code in _MULTIPART_UNSUPPORTED_STATUS:
+                    logger.warning(
+                        f"Docling rejected multipart upload ({response.status_code}), "
+                        f"falling back to base64 JSON"
+                    )
+                    self._multipart_upload = False
+                elif response.status_code == 422:
+                    logger.warning(
+                        f"Docling rejected multipart upload of {filename} (422), "
+                        f"retrying as base64 JSON"
+                    )
+                else:
+                    return response
+
+            # Docling source endpoint requires base64_string, not path
+            base64_content, filename = await self._prepare_source(file_path)
+        except OSError as e:
+            raise DocumentConversionError(
+                f"Failed to read file: {e}",
+                "נכשל בקריאת הקובץ",
+                "Ensure you have permission to read the file"
+            )
+        return await client.post(
+            f"{self.base_url}/v1/convert/source/async",
+            content=_build_file_request_body(
+                base64_content, filename, options.to_json(**fields)
+            ),
+            headers=_JSON_HEADERS,
+            timeout=timeout
+        )
+
+    def _validate_source(self, file_path: str, check_format: bool = True) -> Path:
+        """
+        Check a local document's format and existence, returning its Path.
+
+        Rejections are remembered for NEGATIVE_CACHE_TTL_SECONDS, so agents
+        retrying a bad path get the same error without re-detecting it.
+        """
+        key = (file_path, check_format)
+        now = time.monotonic()
+        rejected = self._neg_cache.get(key)
+        if rejected is not None:
+            if now - rejected[0] < NEGATIVE_CACHE_TTL_SECONDS:
+                raise rejected[1].with_traceback(None)
+            del self._neg_cache[key]
+
+        try:
+            if check_format:
+                # Validate file type
+                file_info = detect_file_type(file_path)
+                if not file_info["supported"]:
+                    raise UnsupportedFormatError(
+                        file_info["error"],
+                        file_info["hebrew_error"],
+                        file_info["suggestion"]
+                    )
+
+            # Check file exists
+            file_path_obj = Path(file_path)
+            if not file_path_obj.exists():
+                raise DocumentFileNotFoundError(
+                    f"File not found: {file_path}",
+                    f"הקובץ לא נמצא: {file_path}",
+                    "Check the file path and ensure the file exists"
+                )
+        except DocumentHelperError as e:
+            if len(self._neg_cache) >= NEGATIVE_CACHE_SIZE:
+                self._neg_cache.pop(next(iter(self._neg_cache)))
+            self._neg_cache[key] = (now, e)
+            raise
+        return file_path_obj
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and drop cached sources (server shutdown)."""
+        self._sources.clear()
+        self._sources_bytes = 0
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def convert_document(
         self,
@@ -376,115 +969,128 @@ class DocumentHelper:
         4. Handle Hebrew/English content
         5. Cache results for reuse
         """
-        import base64
-
-        # Validate file type
-        file_info = detect_file_type(file_path)
-        if not file_info["supported"]:
-            raise UnsupportedFormatError(
-                file_info["error"],
-                file_info["hebrew_error"],
-                file_info["suggestion"]
-            )
-
-        # Check file exists
-        file_path_obj = Path(file_path)
-        if not file_path_obj.exists():
-            raise DocumentFileNotFoundError(
-                f"File not found: {file_path}",
-                f"הקובץ לא נמצא: {file_path}",
-                "Check the file path and ensure the file exists"
-            )
+        file_path_obj = self._validate_source(file_path)
 
         # Normalize output format
         to_format = OUTPUT_FORMAT_MAP.get(output_format.lower(), "md")
 
-        # Check cache
-        cache_key = self.cache.get_cache_key(file_path, to_format, ocr_enabled)
+        # Check cache (hashing reads the file, so keep it off the event loop)
+        cache_key = await asyncio.to_thread(
+            self.cache.get_cache_key, file_path, to_format, ocr_enabled
+        )
         cached = await self.cache.get(cache_key)
         if cached:
             return cached
 
-        # Read file and encode as base64 (Docling API requires base64_string, not path)
+        # Join an identical conversion already running instead of resubmitting.
+        # The conversion runs in its own task; cancelling one caller only
+        # detaches it, and the task is cancelled once no caller is left.
+        shared = self._in_flight.get(cache_key)
+        if shared is None:
+            shared = _SharedConversion(asyncio.create_task(
+                self._convert_uncached(file_path_obj, cache_key, to_format, ocr_enabled)
+            ))
+            self._in_flight[cache_key] = shared
+            shared.task.add_done_callback(
+                lambda _: self._release_in_flight(cache_key, shared)
+            )
+
+        shared.waiters += 1
         try:
-            file_content = file_path_obj.read_bytes()
-            base64_content = base64.b64encode(file_content).decode('utf-8')
-            filename = file_path_obj.name
-        except Exception as e:
-            raise DocumentConversionError(
-                f"Failed to read file: {e}",
-                "נכשל בקריאת הקובץ",
-                "Ensure you have permission to read the file"
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if not shared.waiters and not shared.task.done():
+                self._release_in_flight(cache_key, shared)
+                shared.task.cancel()
+
+    def _release_in_flight(self, cache_key: str, shared: "_SharedConversion") -> None:
+        """Forget a shared conversion unless a newer one replaced it."""
+        if self._in_flight.get(cache_key) is shared:
+            del self._in_flight[cache_key]
+
+    async def convert_many(
+        self,
+        file_paths: List[str],
+        output_format: str = "markdown",
+        ocr_enabled: bool = True
+    ) -> List[Union[str, Exception]]:
+        """
+        Convert several documents concurrently over the shared client.
+
+        At most DOCLING_BATCH_CONCURRENCY files are read and submitted at
+        once. Results are in input order; a failed file yields its exception
+        instead of aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(DOCLING_BATCH_CONCURRENCY)
+
+        async def convert_one(path: str) -> str:
+            async with semaphore:
+                return await self.convert_document(path, output_format, ocr_enabled)
+
+        return await asyncio.gather(
+            *(convert_one(path) for path in file_paths),
+            return_exceptions=True
+        )
+
+    async def _convert_uncached(
+        self,
+        file_path_obj: Path,
+        cache_key: str,
+        to_format: str,
+        ocr_enabled: bool
+    ) -> str:
+        """Upload, convert and cache a document that missed the cache."""
+        result = await self._convert_remote(file_path_obj, to_format, ocr_enabled)
+        await self.cache.set(cache_key, result)
+        return result
+
+    async def _convert_remote(
+        self,
+        file_path_obj: Path,
+        to_format: str,
+        ocr_enabled: bool
+    ) -> str:
+        """
+        Submit one conversion and poll its task to completion.
+
+        The submit request is bounded by DOCLING_SUBMIT_TIMEOUT and polling
+        by self.timeout. A timed-out task is abandoned, not resubmitted.
+        """
+        timeout = DOCLING_SUBMIT_TIMEOUT
+        client = await self._get_client()
+        try:
+            # Start async conversion
+            response = await self._submit_file(
+                file_path_obj,
+                _CONVERT_OPTIONS,
+                timeout=timeout,
+                to_formats=[to_format],
+                ocr=ocr_enabled
             )
+            response.raise_for_status()
+            task = load_json(response.content)
+            task_id = task.get("task_id")
 
-        # Build request for Docling API (matching Gradio UI defaults exactly)
-        # Reference: /home/ilan/BricksLLM/docling/gradio_ui.py lines 658-678
-        request_body = {
-            "sources": [{
-                "kind": "file",
-                "base64_string": base64_content,
-                "filename": filename
-            }],
-            "options": {
-                "to_formats": [to_format],
-                # Pipeline settings - standard first, OCR as fallback only
-                "pipeline": "standard",
-                "pdf_backend": "dlparse_v4",
-                # OCR settings - enabled as fallback, NOT forced
-                "ocr": ocr_enabled,
-                "force_ocr": False,
-                "ocr_engine": "auto",
-                "ocr_lang": ["en", "he"],
-                # Table extraction - accurate mode
-                "table_mode": "accurate",
-                # Image handling - placeholder to avoid large base64 in response
-                "image_export_mode": "placeholder",
-                # Additional options
-                "abort_on_error": False,
-                "return_as_file": False,
-                "do_code_enrichment": False,
-                "do_formula_enrichment": False,
-                "do_picture_classification": False,
-                "do_picture_description": False,
-            },
-            "target": {"kind": "inbody"}
-        }
+            if not task_id:
+                # Synchronous response
+                return self._extract_result(task, to_format)
 
-        # Call Docling API
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                # Start async conversion
-                response = await client.post(
-                    f"{self.base_url}/v1/convert/source/async",
-                    json=request_body
-                )
-                response.raise_for_status()
-                task = response.json()
-                task_id = task.get("task_id")
-
-                if not task_id:
-                    # Synchronous response
-                    result = self._extract_result(task, to_format)
-                    await self.cache.set(cache_key, result)
-                    return result
-
-                # Poll for completion
-                result = await self._poll_until_complete(client, task_id, to_format)
-                await self.cache.set(cache_key, result)
-                return result
+            # Poll for completion
+            return await self._poll_until_complete(client, task_id, to_format)
 
-            except httpx.TimeoutException:
-                raise DocumentTimeoutError(
-                    f"Conversion timeout after {self.timeout}s",
-                    f"עיבוד המסמך חרג מהזמן המותר ({int(self.timeout)} שניות)",
-                    "Try a smaller document or simpler format"
-                )
-            except httpx.HTTPStatusError as e:
-                raise DocumentConversionError(
-                    f"Conversion failed: {e.response.status_code}",
-                    "נכשל בהמרת המסמך",
-                    "Ensure the file is not corrupted"
-                )
+        except httpx.TimeoutException:
+            raise DocumentTimeoutError(
+                f"Conversion timeout after {timeout}s",
+                f"עיבוד המסמך חרג מהזמן המותר ({int(timeout)} שניות)",
+                "Try a smaller document or simpler format"
+            )
+        except httpx.HTTPStatusError as e:
+            raise DocumentConversionError(
+                f"Conversion failed: {e.response.status_code}",
+                "נכשל בהמרת המסמך",
+                "Ensure the file is not corrupted"
+            )
 
     async def convert_url(
         self,
@@ -496,138 +1102,110 @@ class DocumentHelper:
         to_format = OUTPUT_FORMAT_MAP.get(output_format.lower(), "md")
 
         # Build request for Docling API (matching Gradio UI defaults exactly)
-        request_body = {
-            "sources": [{
-                "kind": "http",
-                "url": url
-            }],
-            "options": {
-                "to_formats": [to_format],
-                "pipeline": "standard",
-                "pdf_backend": "dlparse_v4",
-                "ocr": ocr_enabled,
-                "force_ocr": False,
-                "ocr_engine": "auto",
-                "ocr_lang": ["en", "he"],
-                "table_mode": "accurate",
-                "image_export_mode": "placeholder",
-                "abort_on_error": False,
-                "return_as_file": False,
-            },
-            "target": {"kind": "inbody"}
-        }
+        request_body = _build_url_request_body(
+            url,
+            _URL_OPTIONS.to_json(to_formats=[to_format], ocr=ocr_enabled)
+        )
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/v1/convert/source/async",
-                json=request_body
-            )
-            response.raise_for_status()
-            task = response.json()
-            task_id = task.get("task_id")
+        client = await self._get_client()
+        response = await client.post(
+            f"{self.base_url}/v1/convert/source/async",
+            content=request_body,
+            headers=_JSON_HEADERS
+        )
+        response.raise_for_status()
+        task = load_json(response.content)
+        task_id = task.get("task_id")
 
-            if not task_id:
-                return self._extract_result(task, to_format)
+        if not task_id:
+            return self._extract_result(task, to_format)
 
-            return await self._poll_until_complete(client, task_id, to_format)
+        return await self._poll_until_complete(client, task_id, to_format)
 
     async def extract_tables(
         self,
         file_path: str,
-        output_format: str = "json"
+        output_format: str = "json",
+        pretty: bool = False
     ) -> str:
         """Extract tables from document."""
-        # First convert to get structured content
-        result = await self.convert_document(file_path, "json", ocr_enabled=False)
+        if await self._cached_markdown_has_no_tables(file_path):
+            tables = []
+        else:
+            # First convert to get structured content
+            result = await self.convert_document(file_path, "json", ocr_enabled=False)
 
-        # Parse and extract tables
-        try:
-            doc = json.loads(result) if isinstance(result, str) else result
-            tables = doc.get("tables", [])
-
-            if output_format == "json":
-                return json.dumps(
-                    {"tables": tables, "count": len(tables)},
-                    ensure_ascii=False,
-                    indent=2
-                )
-            elif output_format == "csv":
-                return self._tables_to_csv(tables)
-            elif output_format == "markdown":
-                return self._tables_to_markdown(tables)
+            # Parse and extract tables
+            try:
+                doc = load_json(result) if isinstance(result, str) else result
+                tables = doc.get("tables", [])
+            except json.JSONDecodeError:
+                # Return as-is if not JSON
+                return result
 
-            return json.dumps(tables, ensure_ascii=False)
-        except json.JSONDecodeError:
-            # Return as-is if not JSON
-            return result
+        if output_format == "json":
+            return dump_json({"tables": tables, "count": len(tables)}, pretty=pretty)
+        elif output_format == "csv":
+            return self._tables_to_csv(tables)
+        elif output_format == "markdown":
+            return self._tables_to_markdown(tables)
+
+        return dump_json(tables)
+
+    async def _cached_markdown_has_no_tables(self, file_path: str) -> bool:
+        """
+        True when only a markdown conversion is cached and it has no tables.
+
+        Docling renders tables as pipe rows, so a cached markdown result
+        without any lets extract_tables skip the JSON conversion entirely.
+        A cached JSON result is left to convert_document to serve.
+        """
+        self._validate_source(file_path)
+        json_key, *md_keys = await asyncio.to_thread(
+            lambda: [
+                self.cache.get_cache_key(file_path, fmt, ocr)
+                for fmt, ocr in (("json", False), ("md", True), ("md", False))
+            ]
+        )
+        if await self.cache.get(json_key):
+            return False
+        for key in md_keys:
+            markdown = await self.cache.get(key)
+            if markdown:
+                return not markdown.startswith("|") and "\n|" not in markdown
+        return False
 
     async def extract_images(
         self,
         file_path: str,
-        classify: bool = True
+        classify: bool = True,
+        pretty: bool = False
     ) -> str:
         """Extract and classify images from document."""
-        import base64
-
-        # Check file exists and read it
-        file_path_obj = Path(file_path)
-        if not file_path_obj.exists():
-            raise DocumentFileNotFoundError(
-                f"File not found: {file_path}",
-                f"הקובץ לא נמצא: {file_path}",
-                "Check the file path and ensure the file exists"
-            )
-
-        file_content = file_path_obj.read_bytes()
-        base64_content = base64.b64encode(file_content).decode('utf-8')
-        filename = file_path_obj.name
-
-        # Build request with correct Docling API parameters
-        request_body = {
-            "sources": [{
-                "kind": "file",
-                "base64_string": base64_content,
-                "filename": filename
-            }],
-            "options": {
-                "to_formats": ["json"],
-                "pipeline": "standard",
-                "pdf_backend": "dlparse_v4",
-                "image_export_mode": "embedded",  # Need embedded for image extraction
-                "do_picture_classification": classify,
-                "do_picture_description": False,
-                "ocr": False,
-                "force_ocr": False,
-            },
-            "target": {"kind": "inbody"}
-        }
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            # Use async endpoint for consistency
-            response = await client.post(
-                f"{self.base_url}/v1/convert/source/async",
-                json=request_body
-            )
-            response.raise_for_status()
-            task = response.json()
-            task_id = task.get("task_id")
+        # Check file exists
+        file_path_obj = self._validate_source(file_path, check_format=False)
 
-            if not task_id:
-                # Synchronous response
-                result = task
-            else:
-                # Poll for completion
-                result_response = await self._poll_until_complete_raw(client, task_id)
-                result = result_response
-
-            # Extract image information from document
-            document = result.get("document", {})
-            images = document.get("pictures", [])
-            return json.dumps(
-                {"images": images, "count": len(images)},
-                ensure_ascii=False,
-                indent=2
-            )
+        # Use async endpoint for consistency
+        client = await self._get_client()
+        response = await self._submit_file(
+            file_path_obj, _IMAGE_OPTIONS, do_picture_classification=classify
+        )
+        response.raise_for_status()
+        task = load_json(response.content)
+        task_id = task.get("task_id")
+
+        if not task_id:
+            # Synchronous response
+            result = task
+        else:
+            # Poll for completion
+            result_response = await self._poll_until_complete_raw(client, task_id)
+            result = result_response
+
+        # Extract image information from document
+        document = result.get("document", {})
+        images = document.get("pictures", [])
+        return dump_json({"images": images, "count": len(images)}, pretty=pretty)
 
     async def ocr_document(
         self,
@@ -641,18 +1219,19 @@ class DocumentHelper:
             ocr_enabled=True
         )
 
-    async def check_status(self, task_id: str) -> str:
+    async def check_status(self, task_id: str, pretty: bool = False) -> str:
         """Check async job status."""
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(
-                f"{self.base_url}/v1/status/poll/{task_id}"
-            )
-            response.raise_for_status()
-            return json.dumps(response.json(), ensure_ascii=False, indent=2)
+        client = await self._get_client()
+        response = await client.get(
+            f"{self.base_url}/v1/status/poll/{task_id}",
+            timeout=30
+        )
+        response.raise_for_status()
+        return dump_json(load_json(response.content), pretty=pretty)
 
-    async def list_formats(self) -> str:
+    async def list_formats(self, pretty: bool = False) -> str:
         """List supported formats."""
-        return json.dumps({
+        return dump_json({
             "input_formats": list(SUPPORTED_FORMATS.keys()),
             "output_formats": ["markdown", "json", "text", "html"],
             "ocr_languages": ["heb", "eng", "ara", "heb+eng", "ara+heb+eng"],
@@ -663,14 +1242,14 @@ class DocumentHelper:
                 "page_layout": True,
                 "reading_order": True
             }
-        }, ensure_ascii=False, indent=2)
+        }, pretty=pretty)
 
     async def _poll_until_complete(
         self,
         client: httpx.AsyncClient,
         task_id: str,
         to_format: str,
-        poll_interval: float = 5.0
+        max_poll_interval: float = POLL_MAX_INTERVAL
     ) -> str:
         """
         Poll conversion status until complete.
@@ -680,23 +1259,75 @@ class DocumentHelper:
         - Checks task_status field (not status/state)
         - Handles "success", "failure", "revoked" states
 
+        Between polls the local sleep backs off exponentially from
+        POLL_INITIAL_INTERVAL up to max_poll_interval, so short jobs are
+        picked up quickly. The delay resets whenever task_status changes.
+
         Reference: /home/ilan/BricksLLM/docling/gradio_ui.py lines 485-534
         """
-        start = time.time()
         logger.info(f"Starting poll for task {task_id}")
+        result = await self._poll_within(client, task_id, max_poll_interval, self.timeout)
+        return self._extract_result(result, to_format)
+
+    async def _poll_until_complete_raw(
+        self,
+        client: httpx.AsyncClient,
+        task_id: str,
+        max_poll_interval: float = POLL_MAX_INTERVAL
+    ) -> Dict[str, Any]:
+        """Poll until complete and return raw JSON response (for image extraction)."""
+        return await self._poll_within(client, task_id, max_poll_interval, self.timeout)
 
-        while time.time() - start < self.timeout:
+    async def _poll_within(
+        self,
+        client: httpx.AsyncClient,
+        task_id: str,
+        max_poll_interval: float,
+        timeout: float
+    ) -> Dict[str, Any]:
+        """
+        Poll a task to completion under an overall deadline.
+
+        asyncio.timeout runs on the loop's monotonic clock and also cuts off
+        an in-flight poll or result fetch, unlike a wall-clock check between
+        polls.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                return await self._poll_task(client, task_id, max_poll_interval)
+        except TimeoutError:
+            logger.error(f"Task {task_id} abandoned after {timeout}s")
+            raise DocumentTimeoutError(
+                f"Polling timeout after {timeout}s",
+                "עיבוד המסמך לקח יותר מדי זמן",
+                "Try a smaller document"
+            )
+
+    async def _poll_task(
+        self,
+        client: httpx.AsyncClient,
+        task_id: str,
+        max_poll_interval: float
+    ) -> Dict[str, Any]:
+        """Poll a task until it finishes; return the raw result JSON."""
+        delay = POLL_INITIAL_INTERVAL
+        last_status = None
+
+        while True:
             try:
                 # Use ?wait=5 for long polling (matches Gradio UI)
                 response = await client.get(
                     f"{self.base_url}/v1/status/poll/{task_id}?wait=5",
                     timeout=15.0  # Short timeout for individual poll requests
                 )
-                response_data = response.json()
+                response_data = load_json(response.content)
 
                 # Gradio UI uses "task_status" field
                 task_status = response_data.get("task_status", "")
                 logger.info(f"Task {task_id} status: {task_status}")
+                if task_status != last_status:
+                    delay = POLL_INITIAL_INTERVAL
+                    last_status = task_status
 
                 if task_status == "success":
                     logger.info(f"Task {task_id} completed successfully, fetching result")
@@ -704,7 +1335,7 @@ class DocumentHelper:
                         f"{self.base_url}/v1/result/{task_id}",
                         timeout=30.0
                     )
-                    return self._extract_result(result_response.json(), to_format)
+                    return load_json(result_response.content)
 
                 if task_status in ("failure", "revoked"):
                     error_detail = response_data.get("detail", "Unknown conversion error")
@@ -716,63 +1347,14 @@ class DocumentHelper:
                     )
 
                 # Still processing, wait before next poll
-                await asyncio.sleep(poll_interval)
+                await asyncio.sleep(delay)
+                delay = min(max_poll_interval, delay * POLL_BACKOFF_FACTOR)
 
             except httpx.TimeoutException:
                 # Individual poll timeout is OK, continue polling
                 logger.warning(f"Poll request timeout for task {task_id}, retrying...")
-                await asyncio.sleep(poll_interval)
-                continue
-
-        raise DocumentTimeoutError(
-            f"Polling timeout after {self.timeout}s",
-            "עיבוד המסמך לקח יותר מדי זמן",
-            "Try a smaller document"
-        )
-
-    async def _poll_until_complete_raw(
-        self,
-        client: httpx.AsyncClient,
-        task_id: str,
-        poll_interval: float = 5.0
-    ) -> Dict[str, Any]:
-        """Poll until complete and return raw JSON response (for image extraction)."""
-        start = time.time()
-
-        while time.time() - start < self.timeout:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/v1/status/poll/{task_id}?wait=5",
-                    timeout=15.0
-                )
-                response_data = response.json()
-                task_status = response_data.get("task_status", "")
-
-                if task_status == "success":
-                    result_response = await client.get(
-                        f"{self.base_url}/v1/result/{task_id}",
-                        timeout=30.0
-                    )
-                    return result_response.json()
-
-                if task_status in ("failure", "revoked"):
-                    raise DocumentConversionError(
-                        f"Conversion failed: {response_data.get('detail', 'Unknown')}",
-                        "שגיאה בהמרת המסמך",
-                        "Try a different format"
-                    )
-
-                await asyncio.sleep(poll_interval)
-
-            except httpx.TimeoutException:
-                await asyncio.sleep(poll_interval)
-                continue
-
-        raise DocumentTimeoutError(
-            f"Polling timeout after {self.timeout}s",
-            "עיבוד המסמך לקח יותר מדי זמן",
-            "Try a smaller document"
-        )
+                await asyncio.sleep(delay)
+                delay = min(max_poll_interval, delay * POLL_BACKOFF_FACTOR)
 
     def _extract_result(self, response: Dict[str, Any], to_format: str) -> str:
         """
@@ -789,25 +1371,11 @@ class DocumentHelper:
         # Gradio UI structure: response["document"]["{format}_content"]
         document = response.get("document", {})
 
-        if to_format == "md":
-            content = document.get("md_content")
-            if content:
-                return content
-
-        if to_format == "json":
-            json_content = document.get("json_content")
-            if json_content:
-                return json.dumps(json_content, ensure_ascii=False, indent=2)
-
-        if to_format == "html":
-            content = document.get("html_content")
+        content_key = _RESULT_CONTENT_KEYS.get(to_format)
+        if content_key:
+            content = document.get(content_key)
             if content:
-                return content
-
-        if to_format == "text":
-            content = document.get("text_content")
-            if content:
-                return content
+                return dump_json(content, pretty=True) if to_format == "json" else content
 
         # Fallback: try older response structures
         if "documents" in response:
@@ -817,54 +1385,77 @@ class DocumentHelper:
                 if to_format == "md" and "md" in doc:
                     return doc["md"]
                 if to_format == "json":
-                    return json.dumps(doc, ensure_ascii=False, indent=2)
+                    return dump_json(doc, pretty=True)
                 if "content" in doc:
                     return doc["content"]
-                return json.dumps(doc, ensure_ascii=False, indent=2)
+                return dump_json(doc, pretty=True)
 
         if "result" in response:
             return response["result"]
 
         # Last resort: return full response as JSON
         logger.warning(f"Could not extract {to_format} from response, returning raw JSON")
-        return json.dumps(response, ensure_ascii=False, indent=2)
+        return dump_json(response, pretty=True)
 
     def _tables_to_markdown(self, tables: List[dict]) -> str:
         """Convert tables to markdown format."""
-        result = []
-        for i, table in enumerate(tables):
-            result.append(f"### Table {i+1}\n")
+        # Rows go through map(str) and one f-string instead of a generator
+        # and three concatenations each; the list is joined once
+        parts = []
+        for i, table in enumerate(tables, 1):
+            parts.append(f"### Table {i}\n")
             headers = table.get("headers", [])
-            rows = table.get("rows", [])
 
             if headers:
-                result.append("| " + " | ".join(str(h) for h in headers) + " |")
-                result.append("| " + " | ".join(["---"] * len(headers)) + " |")
+                parts.append(f"| {' | '.join(map(str, headers))} |")
+                parts.append("|" + " --- |" * len(headers))
 
-            for row in rows:
+            for row in table.get("rows", []):
                 cells = row if isinstance(row, list) else row.get("cells", [])
-                result.append("| " + " | ".join(str(cell) for cell in cells) + " |")
+                parts.append(f"| {' | '.join(map(str, cells))} |")
 
-            result.append("")
-        return "\n".join(result)
+            parts.append("")
+        return "\n".join(parts)
 
     def _tables_to_csv(self, tables: List[dict]) -> str:
-        """Convert tables to CSV format."""
+        """
+        Convert tables to CSV format.
+
+        Tables whose cells need no quoting are joined directly; csv.writer
+        is only used for tables that contain quotes, commas or newlines.
+        Output is identical either way.
+        """
         import csv
         import io
 
-        output = io.StringIO()
-        writer = csv.writer(output)
+        parts: List[str] = []
 
         for table in tables:
             headers = table.get("headers", [])
             rows = table.get("rows", [])
 
-            if headers:
-                writer.writerow(headers)
-            for row in rows:
-                cells = row if isinstance(row, list) else row.get("cells", [])
-                writer.writerow(cells)
-            writer.writerow([])  # Empty row between tables
+            table_rows = [headers] if headers else []
+            table_rows.extend(
+                row if isinstance(row, list) else row.get("cells", [])
+                for row in rows
+            )
+            str_rows = [
+                ["" if cell is None else str(cell) for cell in row]
+                for row in table_rows
+            ]
+
+            # csv.writer quotes special characters, and a lone empty field
+            needs_quoting = any(
+                (len(row) == 1 and not row[0])
+                or any(_CSV_SPECIAL_RE.search(cell) for cell in row)
+                for row in str_rows
+            )
+            if needs_quoting:
+                output = io.StringIO()
+                csv.writer(output).writerows(str_rows)
+                parts.append(output.getvalue())
+            else:
+                parts.extend(",".join(row) + "\r\n" for row in str_rows)
+            parts.append("\r\n")  # Empty row between tables
 
-        return output.getvalue()
+        return "".join(parts)
@@ -8,6 +8,7 @@ and image classification via the Docling REST API.
 Tools:
     - docling_convert: Convert documents to markdown/JSON/text
     - docling_convert_url: Convert documents from URL
+    - docling_convert_many: Convert several documents concurrently
     - docling_extract_tables: Extract tables from documents
     - docling_extract_images: Extract and classify images
     - docling_ocr: OCR for scanned documents (Hebrew/English)
@@ -16,13 +17,16 @@ Tools:
 """
 
 import logging
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import List
 from fastmcp import FastMCP
 
 from .query_helper import (
     DocumentHelper,
     DocumentHelperError,
     detect_document_intent,
-    detect_file_type,
+    dump_json,
     get_document_schema,
 )
 
@@ -33,13 +37,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger("docling-mcp")
 
-# Initialize FastMCP server
-mcp = FastMCP("docling")
-
 # Initialize document helper
 helper = DocumentHelper()
 
 
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Release the shared Docling HTTP client on shutdown."""
+    try:
+        yield
+    finally:
+        await helper.aclose()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("docling", lifespan=lifespan)
+
+
 def format_error_response(error: Exception) -> str:
     """Format error with Hebrew/English messages."""
     if isinstance(error, DocumentHelperError):
@@ -110,10 +124,45 @@ async def docling_convert_url(
         return format_error_response(e)
 
 
+@mcp.tool()
+async def docling_convert_many(
+    file_paths: List[str],
+    format: str = "markdown",
+    ocr_enabled: bool = True,
+    pretty: bool = False
+) -> str:
+    """
+    Convert several documents concurrently.
+
+    Args:
+        file_paths: Paths to the document files
+        format: Output format - "markdown", "json", or "text"
+        ocr_enabled: Enable OCR for scanned documents (default: True)
+        pretty: Indent the JSON output for human reading (default: False)
+
+    Returns:
+        JSON mapping each file path to its converted content or error
+
+    Examples:
+        - docling_convert_many(["/uploads/a.pdf", "/uploads/b.docx"], "markdown")
+    """
+    try:
+        logger.info(f"Converting {len(file_paths)} documents to {format}")
+        results = await helper.convert_many(file_paths, format, ocr_enabled)
+        return dump_json({
+            path: format_error_response(result) if isinstance(result, Exception) else result
+            for path, result in zip(file_paths, results)
+        }, pretty=pretty)
+    except Exception as e:
+        logger.error(f"Batch conversion failed: {e}")
+        return format_error_response(e)
+
+
 @mcp.tool()
 async def docling_extract_tables(
     file_path: str,
-    output_format: str = "json"
+    output_format: str = "json",
+    pretty: bool = False
 ) -> str:
     """
     Extract tables from a document.
@@ -121,6 +170,7 @@ async def docling_extract_tables(
     Args:
         file_path: Path to the document file
         output_format: Output format - "json", "csv", or "markdown"
+        pretty: Indent the JSON output for human reading (default: False)
 
     Returns:
         Extracted tables in requested format
@@ -131,7 +181,7 @@ async def docling_extract_tables(
     """
     try:
         logger.info(f"Extracting tables from: {file_path}")
-        result = await helper.extract_tables(file_path, output_format)
+        result = await helper.extract_tables(file_path, output_format, pretty)
         logger.info(f"Table extraction successful")
         return result
     except Exception as e:
@@ -142,7 +192,8 @@ async def docling_extract_tables(
 @mcp.tool()
 async def docling_extract_images(
     file_path: str,
-    classify: bool = True
+    classify: bool = True,
+    pretty: bool = False
 ) -> str:
     """
     Extract and classify images from a document.
@@ -150,6 +201,7 @@ async def docling_extract_images(
     Args:
         file_path: Path to the document file
         classify: Whether to classify image types (default: True)
+        pretty: Indent the JSON output for human reading (default: False)
 
     Returns:
         JSON with image metadata and optional classifications
@@ -160,7 +212,7 @@ async def docling_extract_images(
     """
     try:
         logger.info(f"Extracting images from: {file_path}")
-        result = await helper.extract_images(file_path, classify)
+        result = await helper.extract_images(file_path, classify, pretty)
         logger.info(f"Image extraction successful")
         return result
     except Exception as e:
@@ -200,12 +252,13 @@ async def docling_ocr(
 
 
 @mcp.tool()
-async def docling_status(task_id: str) -> str:
+async def docling_status(task_id: str, pretty: bool = False) -> str:
     """
     Check the status of an async conversion job.
 
     Args:
         task_id: The task ID returned from an async conversion
+        pretty: Indent the JSON output for human reading (default: False)
 
     Returns:
         Job status including progress and result if complete
@@ -215,7 +268,7 @@ async def docling_status(task_id: str) -> str:
     """
     try:
         logger.info(f"Checking status for task: {task_id}")
-        result = await helper.check_status(task_id)
+        result = await helper.check_status(task_id, pretty)
         return result
     except Exception as e:
         logger.error(f"Status check failed: {e}")
@@ -223,10 +276,13 @@ async def docling_status(task_id: str) -> str:
 
 
 @mcp.tool()
-async def docling_list_formats() -> str:
+async def docling_list_formats(pretty: bool = False) -> str:
     """
     List all supported document formats.
 
+    Args:
+        pretty: Indent the JSON output for human reading (default: False)
+
     Returns:
         JSON with supported input and output formats,
         OCR languages, and available features.
@@ -235,7 +291,7 @@ async def docling_list_formats() -> str:
         - docling_list_formats()
     """
     try:
-        return await helper.list_formats()
+        return await helper.list_formats(pretty)
     except Exception as e:
         logger.error(f"List formats failed: {e}")
         return format_error_response(e)
@@ -243,13 +299,42 @@ async def docling_list_formats() -> str:
 
 # Additional utility functions exposed as tools
 
+@lru_cache(maxsize=256)
+def _analysis_json(file_path: str, pretty: bool) -> str:
+    """
+    Render the docling_analyze result for a path.
+
+    The analysis is derived from the path alone (no file I/O), so the
+    rendered string is cached per path across repeated analyze calls.
+    """
+    schema = get_document_schema(file_path)
+    file_type = schema["file_type"]
+
+    result = {
+        "file_analysis": schema,
+        "recommendations": {
+            "use_ocr": file_type.get("ocr_default", False),
+            "best_format": "markdown",
+            "supports_tables": file_type.get("handler") in [
+                "pdf", "docx", "xlsx", "html"
+            ],
+            "supports_images": file_type.get("handler") in [
+                "pdf", "docx", "pptx"
+            ],
+        }
+    }
+
+    return dump_json(result, pretty=pretty)
+
+
 @mcp.tool()
-async def docling_analyze(file_path: str) -> str:
+async def docling_analyze(file_path: str, pretty: bool = False) -> str:
     """
     Analyze a document and return its metadata and processing options.
 
     Args:
         file_path: Path to the document file
+        pretty: Indent the JSON output for human reading (default: False)
 
     Returns:
         JSON with file info, supported operations, and recommendations
@@ -258,25 +343,7 @@ async def docling_analyze(file_path: str) -> str:
         - docling_analyze("/uploads/unknown_file.pdf")
     """
     try:
-        schema = get_document_schema(file_path)
-        file_type = detect_file_type(file_path)
-
-        result = {
-            "file_analysis": schema,
-            "recommendations": {
-                "use_ocr": file_type.get("ocr_default", False),
-                "best_format": "markdown",
-                "supports_tables": file_type.get("handler") in [
-                    "pdf", "docx", "xlsx", "html"
-                ],
-                "supports_images": file_type.get("handler") in [
-                    "pdf", "docx", "pptx"
-                ],
-            }
-        }
-
-        import json
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return _analysis_json(file_path, pretty)
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
         return format_error_response(e)
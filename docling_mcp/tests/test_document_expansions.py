@@ -0,0 +1,134 @@
+"""
+Unit Tests for Document Expansions
+
+Checks the optimized index and query expansion against the original
+straightforward implementations.
+"""
+
+from typing import Dict, List, Set
+
+import pytest
+
+from docling_mcp import document_expansions
+from docling_mcp.document_expansions import (
+    DOCUMENT_EXPANSIONS,
+    _build_bidirectional_index,
+    expand_query,
+    get_bidirectional_expansions,
+)
+
+
+SAMPLE_QUERIES = [
+    "pdf",
+    "PDF",
+    "convert the pdf to markdown",
+    "המר את המסמך ל-PDF",
+    "חלץ טבלה מהקובץ",
+    "extract tables from the scanned invoice",
+    "סרוק את התמונה עם ocr",
+    "Translate this Word document to English",
+    "ג'ייסון",
+    "Scan the חשבונית and export to Excel",
+    "פי די אף with plain text and a table",
+    "summarize the הסכם, then merge into one PDF file",
+    "hello world",
+    "",
+]
+
+
+def _reference_index(expansions: Dict[str, List[str]]) -> Dict[str, Set[str]]:
+    """Original per-term set-merging index."""
+    bidirectional: Dict[str, Set[str]] = {}
+    for values in expansions.values():
+        all_terms = {v.lower() for v in values}
+        for term in all_terms:
+            if term in bidirectional:
+                bidirectional[term].update(all_terms)
+            else:
+                bidirectional[term] = all_terms.copy()
+    return bidirectional
+
+
+def _reference_expand_query(query: str) -> Set[str]:
+    """Original per-domain substring scan."""
+    expanded: Set[str] = set()
+    query_lower = query.lower()
+    for terms in DOCUMENT_EXPANSIONS.values():
+        if any(term.lower() in query_lower for term in terms):
+            expanded.update(terms)
+    return expanded
+
+
+class TestBidirectionalIndex:
+    """Test the bidirectional index against the original construction."""
+
+    def test_matches_reference(self):
+        """Every term should map to exactly the original term set."""
+        index = _build_bidirectional_index(DOCUMENT_EXPANSIONS)
+        reference = _reference_index(DOCUMENT_EXPANSIONS)
+        assert index.keys() == reference.keys()
+        for term, expected in reference.items():
+            assert index[term] == expected, term
+
+    def test_no_transitive_merge(self):
+        """Domains linked only through another domain stay separate."""
+        expansions = {
+            "a": ["x", "shared_ab"],
+            "b": ["shared_ab", "shared_bc"],
+            "c": ["shared_bc", "y"],
+        }
+        index = _build_bidirectional_index(expansions)
+        assert index["x"] == {"x", "shared_ab"}
+        assert index["shared_ab"] == {"x", "shared_ab", "shared_bc"}
+        assert "x" not in index["y"]
+
+    def test_shared_sets(self):
+        """Terms with the same owning domains share one frozenset object."""
+        index = _build_bidirectional_index(DOCUMENT_EXPANSIONS)
+        assert index["document"] is index["מסמך"]
+        assert index["image"] is index["תמונה"]
+
+    @pytest.mark.parametrize("term", ["pdf", "PDF", "image", "טבלה", "unknown"])
+    def test_expansions_match_reference(self, term):
+        """Lookups should return the original expansions."""
+        reference = _reference_index(DOCUMENT_EXPANSIONS)
+        expected = reference.get(term.lower(), {term})
+        assert get_bidirectional_expansions(term) == expected
+
+
+class TestExpandQuery:
+    """Test expand_query against the original implementation."""
+
+    @pytest.mark.parametrize("query", SAMPLE_QUERIES)
+    def test_matches_reference(self, query):
+        """Expanded terms should be unchanged from the original."""
+        assert expand_query(query) == _reference_expand_query(query)
+
+    def test_pdf_expansion_size(self):
+        """'pdf' only pulls in the formats domain."""
+        expected = set(DOCUMENT_EXPANSIONS["document_formats"])
+        assert expand_query("pdf") == expected
+
+    def test_bidirectional_index_attribute(self):
+        """BIDIRECTIONAL_INDEX stays available as a module attribute."""
+        index = document_expansions.BIDIRECTIONAL_INDEX
+        assert index is document_expansions.get_bidirectional_index()
+
+
+class TestHyperscanPath:
+    """Test that the Hyperscan scan agrees with the pure-Python fallback."""
+
+    @pytest.fixture
+    def hyperscan_db(self):
+        """Compiled database, skipping when hyperscan is not installed."""
+        pytest.importorskip("hyperscan")
+        if document_expansions._HYPERSCAN_DB is None:
+            pytest.skip("Hyperscan database failed to compile")
+        return document_expansions._HYPERSCAN_DB
+
+    @pytest.mark.parametrize("query", SAMPLE_QUERIES)
+    def test_matches_fallback(self, hyperscan_db, query, monkeypatch):
+        """Both paths should return the same set for mixed-language queries."""
+        with_hyperscan = expand_query(query)
+        monkeypatch.setattr(document_expansions, "_HYPERSCAN_DB", None)
+        assert with_hyperscan == expand_query(query)
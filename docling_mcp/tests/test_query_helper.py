@@ -0,0 +1,172 @@
+"""
+Unit Tests for Document Query Helper
+
+Tests the pure helpers used by DocumentHelper.
+"""
+
+import asyncio
+import json
+import re
+from pathlib import PurePosixPath
+
+import pytest
+
+from docling_mcp import query_helper
+from docling_mcp.query_helper import (
+    DocumentCache,
+    DocumentHelper,
+    _CONVERT_OPTIONS,
+    _FORMAT_PATTERNS,
+    _INTENT_SPECS,
+    _OptionsTemplate,
+    detect_document_intent,
+    _file_extension,
+    _file_name,
+)
+
+
+PATH_CASES = [
+    "report.pdf",
+    "/tmp/Report.PDF",
+    "foo.pdf/",
+    "foo.pdf//",
+    "foo.pdf/.",
+    "a/./",
+    "archive.tar.gz",
+    "a..b",
+    "foo.",
+    ".bashrc",
+    "dir/.hidden",
+    ".a.b",
+    "...",
+    "dir.d/file",
+    "a//b.md",
+    "./scan.png",
+    ".",
+    "..",
+    "/",
+    "",
+]
+
+
+class TestPathHelpers:
+    """Test string-based path helpers against pathlib."""
+
+    @pytest.mark.parametrize("file_path", PATH_CASES)
+    def test_file_extension_matches_suffix(self, file_path):
+        """_file_extension should equal the lowercased Path.suffix."""
+        assert _file_extension(file_path) == PurePosixPath(file_path).suffix.lower()
+
+    @pytest.mark.parametrize("file_path", PATH_CASES)
+    def test_file_name_matches_name(self, file_path):
+        """_file_name should equal Path.name."""
+        assert _file_name(file_path) == PurePosixPath(file_path).name
+
+
+class TestOptionsTemplate:
+    """Test splicing per-call fields into pre-serialized options."""
+
+    @pytest.mark.parametrize("fields", [
+        {},
+        {"ocr": True},
+        {"to_formats": ["md"], "ocr": False},
+        {"do_picture_classification": True, "filename": "דוח.pdf"},
+    ])
+    @pytest.mark.parametrize("options", [
+        {},
+        {"pipeline": "standard", "ocr_lang": ["en", "he"], "force_ocr": False},
+    ])
+    def test_to_json_is_valid(self, options, fields):
+        """to_json should parse back to the merged options."""
+        template = _OptionsTemplate(options)
+        assert json.loads(template.to_json(**fields)) == {**fields, **options}
+
+    def test_to_json_returns_bytes(self):
+        """Bodies are assembled as bytes, with or without fields."""
+        assert isinstance(_CONVERT_OPTIONS.to_json(), bytes)
+        assert isinstance(_CONVERT_OPTIONS.to_json(ocr=True), bytes)
+
+
+ALL_PATTERNS = [
+    pattern
+    for specs in _INTENT_SPECS.values()
+    for patterns in specs.values()
+    for pattern in patterns
+] + [pattern for patterns in _FORMAT_PATTERNS.values() for pattern in patterns]
+
+
+class TestIntentPatterns:
+    """Test the case-folded intent and format patterns."""
+
+    @pytest.mark.parametrize("pattern", ALL_PATTERNS)
+    def test_literals_are_case_folded(self, pattern):
+        """Literal text outside escapes must already be case-folded."""
+        literals = re.sub(r"\\.", "", pattern)
+        assert literals == literals.casefold()
+
+    @pytest.mark.parametrize("query, intent, fmt", [
+        ("Convert this file to JSON", "CONVERT", "json"),
+        ("EXTRACT the TABLES", "EXTRACT_TABLES", "markdown"),
+        ("המר את המסמך לפורמט JSON", "CONVERT", "json"),
+        ("חלץ טבלאות מהדוח", "EXTRACT_TABLES", "markdown"),
+    ])
+    def test_detects_mixed_case_queries(self, query, intent, fmt):
+        """Upper- and mixed-case queries still match the folded patterns."""
+        result = detect_document_intent(query)
+        assert result["intent"] == intent
+        assert result["format"] == fmt
+
+
+class TestSourceCache:
+    """Test byte accounting of the encoded-source LRU."""
+
+    @pytest.fixture
+    def helper(self, tmp_path, monkeypatch):
+        """DocumentHelper with its result cache under tmp_path."""
+        cache_dir = str(tmp_path / "cache")
+        monkeypatch.setattr(
+            query_helper, "DocumentCache", lambda: DocumentCache(cache_dir)
+        )
+        return DocumentHelper()
+
+    @staticmethod
+    def _assert_accounted(helper):
+        assert helper._sources_bytes == sum(map(len, helper._sources.values()))
+
+    @pytest.mark.parametrize("encode", [True, False])
+    def test_concurrent_misses_counted_once(self, helper, tmp_path, encode):
+        """Two concurrent misses on one file must not double-count its size."""
+        path = tmp_path / "doc.pdf"
+        path.write_bytes(b"x" * 9000)
+
+        async def race():
+            return await asyncio.gather(
+                helper._prepare_source(path, encode=encode),
+                helper._prepare_source(path, encode=encode),
+            )
+
+        first, second = asyncio.run(race())
+        assert first == second
+        assert len(helper._sources) == 1
+        self._assert_accounted(helper)
+
+    def test_eviction_keeps_accounting(self, helper, tmp_path, monkeypatch):
+        """Evicting to the byte budget keeps the counter exact."""
+        monkeypatch.setattr(query_helper, "SOURCE_CACHE_MAX_BYTES", 25_000)
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"doc{i}.pdf"
+            path.write_bytes(bytes([i]) * 10_000)
+            paths.append(path)
+
+        async def load():
+            for path in paths:
+                await helper._prepare_source(path, encode=False)
+
+        asyncio.run(load())
+        assert len(helper._sources) == 2
+        self._assert_accounted(helper)
+
+        asyncio.run(helper.aclose())
+        assert not helper._sources
+        self._assert_accounted(helper)
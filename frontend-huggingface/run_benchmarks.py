@@ -7,19 +7,28 @@ Features:
 - Shows detailed per-test PASS/FAIL results
 - Uses Rich Live display to avoid console scrolling
 - Progress bar tracks all 529 individual tests
+- Runs all test files in one vitest process, streaming per-file progress
+  (or one process per file with --per-file, optionally in parallel via --jobs)
 """
 
+import argparse
+import asyncio
+import hashlib
 import json
 import os
 import platform
+import queue
 import sys
 import time
 import re
 import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Iterator, Optional, Set, Tuple
 
 from rich.console import Console
 from rich.panel import Panel
@@ -30,11 +39,64 @@ from rich.text import Text
 from rich.theme import Theme
 from rich import box
 
+# Optional: faster JSON parsing of vitest reports
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: stream the aggregate report one file entry at a time
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Constants
 SCRIPT_DIR = Path(__file__).parent.resolve()
 TEST_DIR = SCRIPT_DIR / "src" / "lib" / "server" / "memory" / "__tests__"
 RESULTS_BASE = SCRIPT_DIR.parent / "Dictachat_testings_results"
 VITEST_TIMEOUT = 180
+# Latency suites assert p95/p99 bounds against shared localhost Mongo/Qdrant/
+# Redis, so test files run one at a time unless --jobs asks otherwise
+DEFAULT_JOBS = 1
+# Run-to-run caches live under node_modules (gitignored), not in the
+# tracked results tree
+CACHE_DIR = SCRIPT_DIR / "node_modules" / ".cache" / "run_benchmarks"
+COUNT_CACHE_PATH = CACHE_DIR / "test_count.json"
+DESC_CACHE_PATH = CACHE_DIR / "descriptions.json"
+
+# Test files (one name per line) that share state unsafely across worker
+# threads and must keep vitest's default forks pool
+FORKS_POOL_LIST = SCRIPT_DIR / ".vitest-forks.txt"
+
+# Long-lived vitest process used by --per-file runs (see vitest-runner.mjs)
+RUNNER_SCRIPT = SCRIPT_DIR / "vitest-runner.mjs"
+RUNNER_RESULT_PREFIX = "@@vitest-runner@@ "
+
+# Reuse Node's on-disk compile cache across the many vitest invocations
+VITEST_ENV = {
+    **os.environ,
+    "NODE_COMPILE_CACHE": os.environ.get(
+        "NODE_COMPILE_CACHE", os.path.join(tempfile.gettempdir(), "node-cc")
+    ),
+}
+
+# JSDoc header parsing for test descriptions
+JSDOC_HEAD_CHARS = 2048
+JSDOC_RE = re.compile(r'/\*\*\s*([\s\S]*?)\*/')
+# Leading " * " of each comment line
+JSDOC_STAR_RE = re.compile(r'^[^\S\n]*\*[^\S\n]?', re.MULTILINE)
+# Trimmed non-empty lines, minus @tags and roampal / "Adapted from" references
+JSDOC_LINE_RE = re.compile(
+    r'^[^\S\n]*(?!@)(?!.*(?:roampal|adapted from))(\S.*?)[^\S\n]*$',
+    re.MULTILINE | re.IGNORECASE
+)
+
+# Default reporter's per-file summary, e.g. " ✓ |server| src/.../x.test.ts (12 tests) 5ms"
+FILE_DONE_RE = re.compile(r'\.test\.ts \((\d+) tests?\b')
+
+# it(...), test(...), it.each(...)(...), test.skip(...), etc. (not regex.test(...))
+TEST_CALL_RE = re.compile(r'(?<![\w.$])(?:it|test)(?:\.\w+)*\s*\(')
 
 # Custom theme
 THEME = Theme({
@@ -90,22 +152,18 @@ def extract_test_description(file_path: Path) -> str:
     Returns the multi-line description explaining what the test does.
     """
     try:
-        content = file_path.read_text(encoding='utf-8')
+        # Match JSDoc comment at the start of the file; only the file's head
+        # is read unless the comment runs past it
+        with open(file_path, encoding='utf-8') as f:
+            content = f.read(JSDOC_HEAD_CHARS)
+            match = JSDOC_RE.search(content)
+            if match is None:
+                match = JSDOC_RE.search(content + f.read())
 
-        # Match JSDoc comment at the start of the file
-        match = re.search(r'/\*\*\s*([\s\S]*?)\*/', content)
         if match:
-            doc = match.group(1)
-            lines = []
-            for line in doc.split('\n'):
-                # Remove leading asterisks and whitespace
-                cleaned = re.sub(r'^\s*\*\s?', '', line).strip()
-                # Skip empty lines, @tags, and roampal references
-                if cleaned and not cleaned.startswith('@'):
-                    # Filter out lines mentioning roampal or "Adapted from"
-                    if 'roampal' in cleaned.lower() or 'adapted from' in cleaned.lower():
-                        continue
-                    lines.append(cleaned)
+            # Remove leading asterisks, then keep the wanted lines in one pass
+            doc = JSDOC_STAR_RE.sub('', match.group(1))
+            lines = JSDOC_LINE_RE.findall(doc)
 
             if lines:
                 return '\n'.join(lines)
@@ -115,6 +173,50 @@ def extract_test_description(file_path: Path) -> str:
         return f"Tests for {file_path.stem}"
 
 
+def load_forks_pool_files() -> Set[str]:
+    """Read test file names listed in FORKS_POOL_LIST (# starts a comment)."""
+    try:
+        lines = FORKS_POOL_LIST.read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return set()
+    return {name for name in (line.split('#', 1)[0].strip() for line in lines) if name}
+
+
+FORKS_POOL_FILES = load_forks_pool_files()
+
+
+def describe_test_files(test_files: List[Path]) -> Dict[Path, str]:
+    """
+    Descriptions for test files, cached in DESC_CACHE_PATH.
+
+    Entries are keyed by path, mtime and size, so only new or edited files
+    are re-parsed; entries for files no longer present are dropped.
+    """
+    try:
+        cache = load_json(DESC_CACHE_PATH.read_bytes())
+    except Exception:
+        cache = {}
+
+    descriptions: Dict[Path, str] = {}
+    fresh: Dict[str, str] = {}
+    for f in test_files:
+        st = f.stat()
+        key = f"{f}:{st.st_mtime_ns}:{st.st_size}"
+        description = cache.get(key)
+        if description is None:
+            description = extract_test_description(f)
+        descriptions[f] = fresh[key] = description
+
+    if fresh != cache:
+        try:
+            DESC_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            DESC_CACHE_PATH.write_bytes(dump_json(fresh))
+        except Exception:
+            pass
+
+    return descriptions
+
+
 def find_test_files() -> List[Path]:
     """Find all test files in test directories."""
     test_files = []
@@ -128,45 +230,122 @@ def find_test_files() -> List[Path]:
     return test_files
 
 
+def load_json(data: bytes):
+    """Parse JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj, pretty: bool = False) -> bytes:
+    """Serialize to JSON bytes, compact or 2-space indented (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None).encode('utf-8')
+
+
+def _test_files_signature(test_files: List[Path]) -> str:
+    """Fingerprint test files by path, mtime and size."""
+    digest = hashlib.sha1()
+    for f in test_files:
+        st = f.stat()
+        digest.update(f"{f}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return digest.hexdigest()
+
+
+def _list_test_count() -> Optional[int]:
+    """
+    Count tests with `vitest list`, which collects tests without running them.
+
+    The JSON goes to a file rather than stdout, so anything the collected
+    test modules log (e.g. "[dotenv] ...") can't corrupt it.
+    """
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = Path(tmp_dir) / "tests.json"
+            result = subprocess.run(
+                ["npx", "vitest", "list", str(TEST_DIR), f"--json={output_path}"],
+                cwd=str(SCRIPT_DIR),
+                env=VITEST_ENV,
+                capture_output=True,
+                text=True,
+                timeout=120
+            )
+            if result.returncode == 0:
+                return len(load_json(output_path.read_bytes()))
+    except Exception:
+        pass
+
+    return None
+
+
+def _scan_test_count(test_files: List[Path]) -> int:
+    """Count it()/test() calls statically (fallback when `vitest list` is unavailable)."""
+    total = 0
+    for f in test_files:
+        try:
+            total += len(TEST_CALL_RE.findall(f.read_text(encoding='utf-8')))
+        except Exception:
+            pass
+    return total
+
+
 def count_total_tests() -> int:
-    """Count total tests by running vitest once."""
+    """
+    Count total tests without executing the suite.
+
+    The count is cached in COUNT_CACHE_PATH, keyed by a fingerprint of the
+    test files, so repeat runs over unchanged tests skip counting entirely.
+    """
+    test_files = sorted(TEST_DIR.rglob("*.test.ts"))
+    signature = _test_files_signature(test_files)
+
     try:
-        result = subprocess.run(
-            ["npx", "vitest", "run", str(TEST_DIR), "--reporter=json"],
-            cwd=str(SCRIPT_DIR),
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
+        cached = json.loads(COUNT_CACHE_PATH.read_text())
+        if cached.get("signature") == signature:
+            return cached["count"]
+    except Exception:
+        pass
 
-        json_start = result.stdout.find("{")
-        if json_start >= 0:
-            data = json.loads(result.stdout[json_start:])
-            return data.get("numTotalTests", 529)
+    count = _list_test_count()
+    if count is None:
+        count = _scan_test_count(test_files)
+    if not count:
+        return 529  # Fallback to known count
+
+    try:
+        COUNT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        COUNT_CACHE_PATH.write_text(json.dumps({"signature": signature, "count": count}))
     except Exception:
         pass
 
-    return 529  # Fallback to known count
+    return count
 
 
 def run_vitest_json(test_file: Path) -> Tuple[Dict, float]:
-    """Run vitest on a single file and return JSON results."""
+    """
+    Run vitest on a single file and return JSON results.
+
+    Uses the worker-threads pool (cheaper startup than a forked child per
+    file) unless the file is listed in FORKS_POOL_LIST.
+    """
     start_time = time.time()
+    pool = "forks" if test_file.name in FORKS_POOL_FILES else "threads"
 
     try:
         result = subprocess.run(
-            ["npx", "vitest", "run", str(test_file), "--reporter=json"],
+            ["npx", "vitest", "run", str(test_file), "--reporter=json", f"--pool={pool}"],
             cwd=str(SCRIPT_DIR),
+            env=VITEST_ENV,
             capture_output=True,
-            text=True,
             timeout=VITEST_TIMEOUT
         )
         duration = time.time() - start_time
 
-        # Parse JSON output
-        json_start = result.stdout.find("{")
+        # Parse JSON output as bytes, skipping any log lines before it
+        json_start = result.stdout.find(b"{")
         if json_start >= 0:
-            data = json.loads(result.stdout[json_start:])
+            data = load_json(result.stdout[json_start:])
             return data, duration
 
         return {"error": "No JSON output"}, duration
@@ -177,6 +356,202 @@ def run_vitest_json(test_file: Path) -> Tuple[Dict, float]:
         return {"error": str(e)}, time.time() - start_time
 
 
+class VitestRunner:
+    """
+    Client for RUNNER_SCRIPT: one Node process that runs test files on a
+    single vitest instance, so per-file Node/vitest startup is skipped.
+    """
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ["node", str(RUNNER_SCRIPT)],
+            cwd=str(SCRIPT_DIR),
+            env=VITEST_ENV,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            errors='replace'
+        )
+
+    def run(self, test_file: Path) -> Tuple[Dict, float]:
+        """Run one test file; raises if the runner dies or times out."""
+        start_time = time.time()
+        killer = threading.Timer(VITEST_TIMEOUT, self.proc.kill)
+        killer.start()
+        try:
+            self.proc.stdin.write(json.dumps({"file": str(test_file)}) + "\n")
+            self.proc.stdin.flush()
+            for line in self.proc.stdout:
+                if line.startswith(RUNNER_RESULT_PREFIX):
+                    return load_json(line[len(RUNNER_RESULT_PREFIX):]), time.time() - start_time
+        finally:
+            killer.cancel()
+        raise RuntimeError("vitest runner exited")
+
+    def close(self):
+        """Ask the runner to exit (EOF on stdin), killing it if it hangs."""
+        if self.proc.poll() is not None:
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=10)
+        except Exception:
+            self.proc.kill()
+            self.proc.wait()
+
+
+def run_test_files(test_files: List[Path], jobs: int) -> Iterator[Tuple[int, Path, Dict, float]]:
+    """
+    Run vitest on test files, up to `jobs` at a time.
+
+    Yields (file_idx, test_file, json_data, duration) as each run finishes.
+    Vitest runs are subprocess-bound, so threads are enough to overlap them.
+    Each worker uses a long-lived VitestRunner when RUNNER_SCRIPT is
+    available, falling back to a one-shot `npx vitest run` per file for
+    forks-pool files, runner errors, or a runner that died.
+    """
+    idle_runners: "queue.Queue[VitestRunner]" = queue.Queue()
+    runners: List[VitestRunner] = []
+    if RUNNER_SCRIPT.exists():
+        for _ in range(jobs):
+            try:
+                runners.append(VitestRunner())
+            except OSError:
+                break
+        for runner in runners:
+            idle_runners.put(runner)
+
+    def run_one(test_file: Path) -> Tuple[Dict, float]:
+        if test_file.name in FORKS_POOL_FILES:
+            return run_vitest_json(test_file)
+        try:
+            runner = idle_runners.get_nowait()
+        except queue.Empty:
+            return run_vitest_json(test_file)
+
+        try:
+            json_data, duration = runner.run(test_file)
+        except Exception:
+            # Broken runner: drop it and use the one-shot path from now on
+            runner.close()
+            return run_vitest_json(test_file)
+
+        idle_runners.put(runner)
+        if "error" in json_data:
+            return run_vitest_json(test_file)
+        return json_data, duration
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {
+                executor.submit(run_one, test_file): (file_idx, test_file)
+                for file_idx, test_file in enumerate(test_files, 1)
+            }
+            try:
+                for future in as_completed(futures):
+                    file_idx, test_file = futures[future]
+                    json_data, duration = future.result()
+                    yield file_idx, test_file, json_data, duration
+            finally:
+                # Don't start queued files after an interrupt or error
+                for future in futures:
+                    future.cancel()
+    finally:
+        for runner in runners:
+            runner.close()
+
+
+def run_vitest_aggregate(
+    test_files: List[Path],
+    on_file_done: Callable[[int], None]
+) -> Iterator[Tuple[int, Path, Dict, float]]:
+    """
+    Run all test files in a single vitest process.
+
+    Node/vitest bootstrap is paid once instead of once per file. Progress
+    streams from the default reporter's per-file summary lines (each
+    finished file's test count is passed to on_file_done); the JSON report
+    is then split per file and yielded like run_test_files, in discovery
+    order.
+    """
+    # One pool per process: forks for the whole run if any file needs it
+    pool = "forks" if any(f.name in FORKS_POOL_FILES for f in test_files) else "threads"
+    start_time = time.time()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = Path(tmp_dir) / "results.json"
+        try:
+            proc = subprocess.Popen(
+                [
+                    "npx", "vitest", "run", *map(str, test_files),
+                    "--reporter=default", "--reporter=json",
+                    f"--outputFile.json={output_path}", f"--pool={pool}",
+                    # Files one after another, so latency suites don't contend
+                    "--no-file-parallelism",
+                ],
+                cwd=str(SCRIPT_DIR),
+                env={**VITEST_ENV, "NO_COLOR": "1"},
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding='utf-8',
+                errors='replace'
+            )
+        except OSError as e:
+            # e.g. npx not installed: report it per file, like run_vitest_json
+            for file_idx, test_file in enumerate(test_files, 1):
+                yield file_idx, test_file, {"error": str(e)}, 0.0
+            return
+
+        # Same per-file budget as the per-file mode, for the whole run
+        killer = threading.Timer(VITEST_TIMEOUT * len(test_files), proc.kill)
+        killer.start()
+        try:
+            for line in proc.stdout:
+                match = FILE_DONE_RE.search(line)
+                if match:
+                    on_file_done(int(match.group(1)))
+            proc.wait()
+        finally:
+            killer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+        by_file: Dict[Path, Dict] = {}
+        error = "No results for file"
+        try:
+            with open(output_path, "rb") as f:
+                if ijson is not None:
+                    entries = ijson.items(f, "testResults.item", use_float=True)
+                else:
+                    entries = load_json(f.read()).get("testResults", [])
+                for entry in entries:
+                    by_file[Path(entry.get("name", "")).resolve()] = entry
+        except Exception as e:
+            error = f"No JSON output: {e}"
+
+    duration = time.time() - start_time
+
+    for file_idx, test_file in enumerate(test_files, 1):
+        entry = by_file.get(test_file.resolve())
+        if entry is None:
+            yield file_idx, test_file, {"error": error}, duration
+            continue
+
+        assertions = entry.get("assertionResults", [])
+        json_data = {
+            "numTotalTests": len(assertions),
+            "numPassedTests": sum(1 for a in assertions if a.get("status") == "passed"),
+            "numFailedTests": sum(1 for a in assertions if a.get("status") == "failed"),
+            "testResults": [entry],
+        }
+        file_duration = (entry.get("endTime", 0) - entry.get("startTime", 0)) / 1000
+        yield file_idx, test_file, json_data, max(file_duration, 0.0)
+
+
 def parse_test_results(json_data: Dict) -> List[TestResult]:
     """Parse vitest JSON output into TestResult objects."""
     results = []
@@ -195,52 +570,67 @@ def parse_test_results(json_data: Dict) -> List[TestResult]:
 
 
 def create_results_dir() -> Path:
-    """Create a timestamped results directory."""
+    """Create a timestamped results directory (<dd-mm-yyyy>_<NN>)."""
     RESULTS_BASE.mkdir(parents=True, exist_ok=True)
 
     today = datetime.now().strftime("%d-%m-%Y")
-    num = 1
-
-    while (RESULTS_BASE / f"{today}_{num:02d}").exists():
-        num += 1
-
-    results_dir = RESULTS_BASE / f"{today}_{num:02d}"
-    results_dir.mkdir(parents=True, exist_ok=True)
+    prefix = f"{today}_"
+
+    # One directory listing instead of a stat per earlier run today
+    with os.scandir(RESULTS_BASE) as entries:
+        nums = [
+            int(entry.name[len(prefix):])
+            for entry in entries
+            if entry.name.startswith(prefix)
+            and entry.name[len(prefix):].isdigit()
+            and entry.is_dir()
+        ]
+    num = max(nums, default=0) + 1
+
+    while True:
+        results_dir = RESULTS_BASE / f"{prefix}{num:02d}"
+        try:
+            results_dir.mkdir()
+            return results_dir
+        except FileExistsError:
+            # Another run took this number meanwhile
+            num += 1
+
+
+async def _command_output(*cmd: str, timeout: float = 10) -> Optional[str]:
+    """Run a command and return its stripped stdout, or None if it can't run."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+    except Exception:
+        return None
 
-    return results_dir
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout)
+    except Exception:
+        proc.kill()
+        await proc.wait()
+        return None
+    return stdout.decode(errors='replace').strip()
 
 
-def get_system_info() -> Dict[str, str]:
-    """Collect system information."""
+async def get_system_info() -> Dict[str, str]:
+    """Collect system information (version probes run concurrently)."""
     info = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "hostname": platform.node(),
         "platform": f"{platform.system()} {platform.release()}",
     }
 
-    # Node version
-    try:
-        result = subprocess.run(["node", "--version"], capture_output=True, text=True, timeout=10)
-        info["node"] = result.stdout.strip()
-    except Exception:
-        info["node"] = "N/A"
-
-    # NPM version
-    try:
-        result = subprocess.run(["npm", "--version"], capture_output=True, text=True, timeout=10)
-        info["npm"] = result.stdout.strip()
-    except Exception:
-        info["npm"] = "N/A"
-
-    # GPU info
-    try:
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader"],
-            capture_output=True, text=True, timeout=10
-        )
-        info["gpu"] = result.stdout.strip().split("\n")[0]
-    except Exception:
-        info["gpu"] = "N/A"
+    node, npm, gpu = await asyncio.gather(
+        _command_output("node", "--version"),
+        _command_output("npm", "--version"),
+        _command_output("nvidia-smi", "--query-gpu=name", "--format=csv,noheader"),
+    )
+    info["node"] = node if node is not None else "N/A"
+    info["npm"] = npm if npm is not None else "N/A"
+    info["gpu"] = gpu.split("\n")[0] if gpu is not None else "N/A"
 
     return info
 
@@ -336,14 +726,39 @@ def show_test_plan(total_files: int, total_tests: int):
     console.print()
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="DictaChat Memory System Benchmark Runner")
+    parser.add_argument(
+        "--per-file",
+        action="store_true",
+        help="Run each test file in its own vitest process (isolated, slower)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=(
+            f"With --per-file, number of test files to run in parallel "
+            f"(default: {DEFAULT_JOBS}). Values above 1 are faster but parallel "
+            f"files share the local Mongo/Qdrant/Redis, which skews latency "
+            f"numbers and can fail p95/p99 thresholds"
+        )
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main entry point."""
+    args = parse_args()
+    jobs = max(1, args.jobs)
+
     console.clear()
     show_banner()
 
     # Collect system info
     console.print("[info]Collecting system information...[/]")
-    sys_info = get_system_info()
+    sys_info = asyncio.run(get_system_info())
     show_system_info(sys_info)
 
     # Find test files
@@ -353,6 +768,9 @@ def main():
         console.print("[error]No test files found![/]")
         sys.exit(1)
 
+    # Test descriptions (cached across runs)
+    descriptions = describe_test_files(test_files)
+
     # Count total tests
     console.print("[info]Counting total tests across all files...[/]")
     total_tests = count_total_tests()
@@ -363,13 +781,18 @@ def main():
 
     # Show test plan
     show_test_plan(len(test_files), total_tests)
+    if args.per_file and jobs > 1:
+        console.print(f"[info]Running up to {jobs} test file(s) in parallel[/]\n")
+    elif args.per_file:
+        console.print("[info]Running test files one at a time[/]\n")
+    else:
+        console.print("[info]Running all test files in a single vitest process[/]\n")
 
     # Initialize tracking
     file_results: List[TestFileResult] = []
     current_test = 0
     total_passed = 0
     total_failed = 0
-    failed_tests: List[Tuple[str, str]] = []
 
     console.print("[header]🚀 Starting test execution...[/]\n")
 
@@ -387,12 +810,25 @@ def main():
 
         overall_task = progress.add_task("[cyan]Overall Progress", total=total_tests)
 
-        for file_idx, test_file in enumerate(test_files, 1):
+        # Tests already counted from the aggregate run's streamed progress
+        streamed = 0
+
+        if args.per_file:
+            file_runs = run_test_files(test_files, jobs)
+        else:
+            def on_file_done(num_tests: int):
+                nonlocal streamed
+                streamed += num_tests
+                progress.update(overall_task, completed=streamed)
+
+            file_runs = run_vitest_aggregate(test_files, on_file_done)
+
+        for file_idx, test_file, json_data, duration in file_runs:
             file_result = TestFileResult(
                 file_path=test_file,
                 name=test_file.stem.replace(".test", "")
             )
-            file_result.description = extract_test_description(test_file)
+            file_result.description = descriptions[test_file]
 
             # Display test file header with description
             console.print()
@@ -409,8 +845,6 @@ def main():
             )
             console.print(desc_panel)
 
-            # Run the test file
-            json_data, duration = run_vitest_json(test_file)
             file_result.duration = duration
 
             # Parse individual test results
@@ -426,10 +860,9 @@ def main():
                         total_passed += 1
                     elif test.status == "failed":
                         total_failed += 1
-                        failed_tests.append((file_result.name, test.name))
 
                     # Update progress bar
-                    progress.update(overall_task, completed=current_test)
+                    progress.update(overall_task, completed=max(current_test, streamed))
 
                 # Print summary for this file showing pass/fail counts
                 console.print(
@@ -449,7 +882,7 @@ def main():
                 total_passed += num_passed
                 total_failed += num_failed
                 current_test += num_passed + num_failed
-                progress.update(overall_task, completed=current_test)
+                progress.update(overall_task, completed=max(current_test, streamed))
 
                 console.print(f"  [warning]⚠ Could not parse individual tests[/]")
                 console.print(f"  [dim]Summary: {num_passed} passed, {num_failed} failed[/]")
@@ -458,8 +891,17 @@ def main():
 
             # Save individual JSON result
             json_path = results_dir / f"{file_result.name}.json"
-            with open(json_path, "w") as f:
-                json.dump(json_data, f, indent=2)
+            json_path.write_bytes(dump_json(json_data, pretty=True))
+
+    # Report files in discovery order, not completion order
+    file_order = {test_file: idx for idx, test_file in enumerate(test_files)}
+    file_results.sort(key=lambda fr: file_order[fr.file_path])
+    failed_tests = [
+        (fr.name, test.name)
+        for fr in file_results
+        for test in fr.tests
+        if test.status == "failed"
+    ]
 
     # Generate report
     report_path = generate_report(results_dir, file_results, total_tests, sys_info)
@@ -0,0 +1,74 @@
+/**
+ * Long-lived vitest runner for run_benchmarks.py.
+ *
+ * Boots vitest once, then reads one JSON request per line on stdin
+ * ({"file": "<path>"}) and runs that test file on the same instance, so
+ * Node/vitest startup is paid once instead of once per file.
+ *
+ * Each result is written to stdout as a single line prefixed with
+ * RESULT_PREFIX, shaped like the subset of vitest's JSON reporter output
+ * that run_benchmarks.py reads. Any other stdout output is ignored.
+ */
+
+import { createInterface } from "node:readline";
+import { createVitest } from "vitest/node";
+
+const RESULT_PREFIX = "@@vitest-runner@@ ";
+
+function emit(result) {
+	process.stdout.write(RESULT_PREFIX + JSON.stringify(result) + "\n");
+}
+
+function toJsonReport(testModules) {
+	const testResults = [];
+	let passed = 0;
+	let failed = 0;
+	let total = 0;
+
+	for (const testModule of testModules) {
+		const assertionResults = [];
+		for (const testCase of testModule.children.allTests()) {
+			const status = testCase.result().state;
+			assertionResults.push({
+				title: testCase.name,
+				status,
+				duration: testCase.diagnostic()?.duration ?? 0,
+			});
+			total += 1;
+			if (status === "passed") passed += 1;
+			else if (status === "failed") failed += 1;
+		}
+		testResults.push({ name: testModule.moduleId, assertionResults });
+	}
+
+	return {
+		numTotalTests: total,
+		numPassedTests: passed,
+		numFailedTests: failed,
+		testResults,
+	};
+}
+
+const vitest = await createVitest("test", {
+	watch: false,
+	pool: "threads",
+	// Silent reporter: results go out over the line protocol only
+	reporters: [{}],
+});
+
+const requests = createInterface({ input: process.stdin });
+
+for await (const line of requests) {
+	if (!line.trim()) continue;
+
+	try {
+		const { file } = JSON.parse(line);
+		const specifications = await vitest.globTestSpecifications([file]);
+		const { testModules } = await vitest.runTestSpecifications(specifications);
+		emit(toJsonReport(testModules));
+	} catch (error) {
+		emit({ error: String(error?.message ?? error) });
+	}
+}
+
+await vitest.close();